@@ -1,74 +1,638 @@
 # src/ai_engine/enhanced_test_generator.py
+import asyncio
+import functools
+import itertools
 import json
+import random
 import re
-from typing import Dict, List, Any, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Any, Literal, Mapping, Optional, Sequence, Tuple
 import logging
-from openai import OpenAI
+import httpx
+import openai
+from openai import AsyncOpenAI
+from ai_engine.response_cache import ResponseCache
 import time
+from ai_engine.prompt_templates import (
+    UNIFIED_ANALYSIS_PROMPT, FIELD_EXTRACTION_PROMPT, MAKER_VALIDATION_PROMPT, CHECKER_VALIDATION_PROMPT,
+    USER_STORY_PROMPT, VALIDATION_TEST_PROMPT, STORY_TEST_PROMPT, MULTI_STORY_TEST_PROMPT
+)
+
+try:
+    import orjson  # optional, several times faster than json for large responses
+except ImportError:
+    orjson = None
+
+try:
+    import tiktoken  # optional, exact token counts for prompt budgets
+except ImportError:
+    tiktoken = None
 
 logger = logging.getLogger(__name__)
 
+# Transient API failures worth retrying. BadRequestError (e.g. prompt too long) is
+# deliberately absent - retrying the same prompt cannot succeed.
+RETRYABLE_API_ERRORS = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError)
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Server-suggested wait from a Retry-After header, if any"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+def _retry(max_attempts: int = 3, base: float = 1.0, max_delay: float = 60.0):
+    """Retry an async API call with exponential backoff and jitter on transient errors"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(max_attempts):
+                try:
+                    return await func(*args, **kwargs)
+                except RETRYABLE_API_ERRORS as e:
+                    if attempt == max_attempts - 1:
+                        raise
+                    delay = base * 2 ** attempt + random.uniform(0, 0.25)
+                    retry_after = _retry_after_seconds(e)
+                    if retry_after is not None:
+                        delay = max(delay, retry_after)
+                    delay = min(delay, max_delay)
+                    logger.warning(f"{type(e).__name__} on attempt {attempt + 1}/{max_attempts}, "
+                                   f"retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+        return wrapper
+    return decorator
+
+# Field keys requested by the PACS.008 extraction prompt. The user-story prompt only needs
+# these names, so it can run concurrently with the extraction instead of waiting for it.
+PACS008_EXTRACTION_FIELDS = (
+    "message_identification", "creation_date_time", "number_of_transactions",
+    "settlement_method", "instructing_agent_bic", "instructed_agent_bic",
+    "interbank_settlement_amount", "settlement_currency", "interbank_settlement_date",
+    "instruction_identification", "end_to_end_identification", "uetr",
+    "debtor_agent_bic", "creditor_agent_bic", "debtor_account", "creditor_account",
+    "charge_bearer", "remittance_information"
+)
+
+JSON_OBJECT_FORMAT = {"type": "json_object"}
+
+# Patterns used on every document, compiled once at import
+_WS_RE = re.compile(r'\s+')
+_STORY_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE | re.DOTALL) for pattern in (
+    r'(?:As\s+(?:a|an)\s+.+?I\s+want\s+.+?(?:so\s+that|in\s+order\s+to).+?)(?=As\s+(?:a|an)|$)',
+    r'(?:User\s+Story\s*:?\s*.+?)(?=User\s+Story|$)',
+    r'(?:Given\s+.+?When\s+.+?Then\s+.+?)(?=Given|$)',
+    r'(?:Scenario\s*:?\s*.+?)(?=Scenario|$)'
+))
+# Indicators for _is_pacs008_content, matched case-insensitively as plain substrings
+PACS008_INDICATORS = (
+    "pacs.008", "pacs008", "FI to FI Customer Credit Transfer",
+    "Debtor Agent", "Creditor Agent", "Interbank Settlement",
+    "ISO 20022", "Business Application Header", "BAH",
+    "Group Header", "Credit Transfer Transaction Information"
+)
+_PACS008_INDICATOR_RE = re.compile('|'.join(map(re.escape, PACS008_INDICATORS)), re.IGNORECASE)
+PACS008_INDICATOR_THRESHOLD = 3
+
+_SECTION_SPLIT_RE = re.compile(r'\n(?=\d+\.|[A-Z][A-Z\s]+:|\#|\*)')
+_EXACT_COUNT_RE = re.compile(r'exactly (\d+) test cases')
+
+# Generation modes: "auto" detects PACS.008 content, the others skip detection
+GenerationMode = Literal["auto", "pacs008", "standard"]
+_PACS_MODE_HINT_RE = re.compile(r'\bpacs', re.IGNORECASE)
+_STANDARD_MODE_HINT_RE = re.compile(r'\bstandard\b', re.IGNORECASE)
+
+class _CleanTable(dict):
+    """str.translate table replacing every character that is not a word character,
+    whitespace or allowed punctuation with a space.
+
+    Filled lazily per code point, so only characters actually seen get an entry instead
+    of building a table for all 0x110000 code points up front.
+    """
+    
+    ALLOWED_PUNCTUATION = frozenset('-.,:;()[]"\'/@#$%&*+=<>?_')
+    
+    def __missing__(self, code_point: int) -> int:
+        char = chr(code_point)
+        # Same classes as the regex \w and \s: str.isalnum() plus underscore, str.isspace()
+        if char.isalnum() or char.isspace() or char in self.ALLOWED_PUNCTUATION:
+            replacement = code_point
+        else:
+            replacement = 0x20
+        self[code_point] = replacement
+        return replacement
+
+_CLEAN_TABLE = _CleanTable()
+
+# Only these parts of the maker/checker output are referenced by the test generation prompt
+TEST_PROMPT_MAKER_KEYS = ("field_name", "field_value", "validation_status", "validation_reason")
+TEST_PROMPT_CHECKER_KEYS = ("overall_status", "decision_summary", "critical_issues_count")
+
+# Token budgets for document content. Without tiktoken they are approximated as 4 chars/token.
+CONTENT_TOKEN_LIMIT = 4000      # whole cleaned document
+FIELD_PROMPT_TOKENS = 2500      # field extraction / unified analysis prompts
+STORY_PROMPT_TOKENS = 2000      # user story prompts
+CHARS_PER_TOKEN = 4
+
+# Stories packed into one standard-generation request; bounded so the combined answer
+# stays well inside the model's output limit
+STORIES_PER_REQUEST = 4
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
+    """o200k_base encoding used by the gpt-4o / gpt-4.1 families, or None if unavailable"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:  # the BPE file is downloaded on first use
+        logger.warning(f"tiktoken encoding unavailable, using character estimates: {str(e)}")
+        return None
+
+@functools.lru_cache(maxsize=16)
+def _encode(text: str) -> Tuple[int, ...]:
+    """Token ids for text; memoised so each document is encoded once across all prompts"""
+    return tuple(_get_encoding().encode(text, disallowed_special=()))
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    """Longest prefix of text that fits in max_tokens"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+    
+    # Every token covers at least one UTF-8 byte, and a character is at most four bytes
+    if len(text) * 4 <= max_tokens:
+        return text
+    tokens = _encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    # A cut inside a multi-byte character would otherwise decode to U+FFFD
+    return encoding.decode_bytes(tokens[:max_tokens]).decode('utf-8', errors='ignore')
+
+# Responses above this size are decoded in a worker thread instead of on the event loop
+LARGE_RESPONSE_CHARS = 16000
+
+def _loads(text: str) -> Any:
+    """json.loads, via orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def _extract_json(text: str, open_char: str = '{', close_char: str = '}') -> Optional[str]:
+    """First balanced open_char...close_char span in text, or None.
+    
+    A single left-to-right pass tracking depth; brackets inside JSON strings are ignored.
+    """
+    start = text.find(open_char)
+    if start < 0:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == open_char:
+            depth += 1
+        elif char == close_char:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+def _parse_json(text: str) -> Any:
+    """Decode a model response; falls back to the first embedded JSON object or array.
+    
+    JSON mode normally returns clean JSON, so the scan only runs for responses wrapped in prose.
+    """
+    try:
+        return _loads(text)
+    except ValueError:
+        for open_char, close_char in (('{', '}'), ('[', ']')):
+            payload = _extract_json(text, open_char, close_char)
+            if payload is not None:
+                try:
+                    return _loads(payload)
+                except ValueError:
+                    continue
+        raise
+
+def _compact_json(data: Any) -> str:
+    """JSON for embedding in a prompt - no indentation, since whitespace is billed as input tokens"""
+    if orjson is not None:
+        return orjson.dumps(data, default=dict, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=dict)
+
+def _decode_results(text: str) -> Any:
+    """Decode JSON-mode output, unwrapping the {"results": [...]} envelope used for arrays"""
+    data = _parse_json(text)
+    if isinstance(data, dict):
+        return data.get("results", data)
+    return data
+
+async def _decode_results_async(text: str) -> Any:
+    """_decode_results(), moved off the event loop for large responses"""
+    if len(text) < LARGE_RESPONSE_CHARS:
+        return _decode_results(text)
+    return await asyncio.get_event_loop().run_in_executor(None, _decode_results, text)
+
+def _json_results(response) -> Any:
+    """_decode_results() for a non-streamed chat completion"""
+    return _decode_results(response.choices[0].message.content)
+
+def _freeze(value: Any) -> Any:
+    """Read-only view of nested dict/list literals: MappingProxyType for dicts, tuples for lists"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _thaw(value: Any) -> Any:
+    """Mutable deep copy of a _freeze()d value, for results handed back to callers"""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(item) for item in value]
+    return value
+
+# Fallback data shared by every call, frozen so no caller can alter the shared copy
+EXAMPLE_PACS_FIELDS = _freeze({
+    "message_identification": "MSG20250803001",
+    "creation_date_time": "2025-08-03T10:30:00Z",
+    "number_of_transactions": "1",
+    "settlement_method": "INDA",
+    "instructing_agent_bic": "BANKAUAAXXX",
+    "instructed_agent_bic": "BANKUSBBXXX",
+    "interbank_settlement_amount": "565000.00",
+    "settlement_currency": "USD",
+    "interbank_settlement_date": "2025-08-03",
+    "instruction_identification": "INSTR123456789012",
+    "end_to_end_identification": "CORPORATIONXENDTOENDID",
+    "uetr": "d0b7077f-49fb-42ed-b78d-af331c0e5012",
+    "debtor_agent_bic": "BANKAUAAXXX",
+    "creditor_agent_bic": "BANKGBCCXXX",
+    "debtor_account": "123456789",
+    "creditor_account": "GB11111111111111111111",
+    "charge_bearer": "DEBT",
+    "remittance_information": "Contract 123"
+})
+
+DEFAULT_USER_STORIES = _freeze([
+    {
+        "user_story_id": "US001",
+        "user_story": "As a Bank Officer, I want to create valid PACS.008 messages so that interbank payments are processed correctly",
+        "business_context": "PACS.008 message creation and validation for interbank transfers",
+        "acceptance_criteria": [
+            {
+                "ac_id": "AC001",
+                "ac_description": "PACS.008 message must contain all mandatory fields with valid formats",
+                "pacs008_fields": ["message_identification", "instructing_agent_bic", "instructed_agent_bic"],
+                "validation_focus": "mandatory field presence and format validation",
+                "test_scenarios": ["valid creation", "missing field validation", "invalid format rejection"]
+            }
+        ]
+    },
+    {
+        "user_story_id": "US002",
+        "user_story": "As a Checker, I want to review and approve PACS.008 messages so that only valid payments are processed",
+        "business_context": "Maker-checker workflow for PACS.008 message approval",
+        "acceptance_criteria": [
+            {
+                "ac_id": "AC002",
+                "ac_description": "Checker must validate business rules before approving PACS.008 messages",
+                "pacs008_fields": ["interbank_settlement_amount", "charge_bearer", "settlement_method"],
+                "validation_focus": "business rule validation and approval workflow",
+                "test_scenarios": ["approval process", "rejection with reasons", "business rule verification"]
+            }
+        ]
+    }
+])
+
+FALLBACK_TEST_CASES = _freeze([
+    {
+        "User Story ID": "US001",
+        "Acceptance Criteria ID": "AC001",
+        "Scenario": "PACS.008 Message Creation",
+        "Test Case ID": "TC001",
+        "Test Case Description": "Verify successful PACS.008 message creation with valid mandatory fields",
+        "Precondition": "User logged in as Maker role with appropriate permissions",
+        "Steps": "1. Navigate to PACS.008 message creation\n2. Enter Message ID: MSG20250803001\n3. Enter Instructing Agent BIC: BANKAUAAXXX\n4. Enter Instructed Agent BIC: BANKUSBBXXX\n5. Enter Settlement Amount: 100000.00 USD\n6. Submit for validation",
+        "Expected Result": "PACS.008 message created successfully and submitted for checker approval",
+        "Part of Regression": "Yes",
+        "Priority": "High",
+        "Role_Focus": "Maker",
+        "PACS008_Fields_Tested": ["message_identification", "instructing_agent_bic", "instructed_agent_bic", "interbank_settlement_amount"],
+        "Validation_Type": "Format"
+    },
+    {
+        "User Story ID": "US001",
+        "Acceptance Criteria ID": "AC001",
+        "Scenario": "Invalid BIC Format Validation",
+        "Test Case ID": "TC002",
+        "Test Case Description": "Verify PACS.008 rejects invalid BIC format in Instructing Agent field",
+        "Precondition": "User logged in as Maker role",
+        "Steps": "1. Navigate to PACS.008 message creation\n2. Enter valid Message ID\n3. Enter invalid Instructing Agent BIC: INVALID123\n4. Enter valid Instructed Agent BIC\n5. Attempt to submit",
+        "Expected Result": "Validation error displayed: 'Invalid BIC format for Instructing Agent'",
+        "Part of Regression": "Yes",
+        "Priority": "High",
+        "Role_Focus": "Maker",
+        "PACS008_Fields_Tested": ["instructing_agent_bic"],
+        "Validation_Type": "Format"
+    }
+])
+
 class EnhancedTestCaseGenerator:
     """AI-powered test case generation with PACS.008 field intelligence and Maker-Checker workflow"""
     
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
+    REQUIRED_FIELDS = (
+        "User Story ID", "Acceptance Criteria ID", "Scenario", "Test Case ID",
+        "Test Case Description", "Precondition", "Steps", "Expected Result",
+        "Part of Regression", "Priority"
+    )
+    ENHANCED_FIELDS = ("Role_Focus", "PACS008_Fields_Tested", "Validation_Type")
+    
+    def __init__(self, api_key: str, max_concurrent: int = 10, cache: Optional[ResponseCache] = None):
+        # httpx's default pool would cap concurrency well below max_concurrent
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_concurrent * 2,
+                                max_keepalive_connections=max_concurrent),
+            timeout=httpx.Timeout(600.0, connect=5.0)  # same as the OpenAI client default
+        )
+        self.client = AsyncOpenAI(api_key=api_key, http_client=self._http_client)
         self.model = "gpt-4.1-mini-2025-04-14"
         self.maker_checker_enabled = True
+        self.max_concurrent = max_concurrent
+        self._loop = None
+        self._semaphore = None
+        self._semaphore_loop = None
+        self._batch_docs = {}  # batch id -> {doc id: (content, custom_instructions)}
+        # Analysis steps that do not depend on custom_instructions are cached by input hash
+        self._cache = cache if cache is not None else ResponseCache()
+        
+    def generate_test_cases(self, content: str, custom_instructions: str = "",
+                            mode: GenerationMode = "auto") -> List[Dict[str, Any]]:
+        """Enhanced test case generation with maker-checker validation (blocking wrapper)"""
+        return self._run_sync(self.generate_test_cases_async(content, custom_instructions, mode))
+    
+    def _run_sync(self, coro):
+        """Run a coroutine to completion on this generator's private event loop"""
+        # A long-lived loop (rather than asyncio.run per call) keeps the AsyncOpenAI
+        # connection pool usable across calls
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+    
+    def _cached(self, stage: str, *inputs: Any) -> Tuple[str, Optional[Any]]:
+        """Cache key for a stage's inputs (including the model) and the cached result, if any"""
+        key = ResponseCache.make_key(self.model, stage, *inputs)
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.info(f"♻️ Reusing cached {stage} result")
+        return key, cached
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore bounding in-flight requests, created for the running loop"""
+        loop = asyncio.get_event_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    @_retry(max_attempts=3, base=1.0)
+    async def _create_chat_completion(self, **kwargs):
+        """Single entry point for chat completions: bounded concurrency plus retry"""
+        # The semaphore is taken per attempt, so backoff sleeps do not hold a slot
+        async with self._get_semaphore():
+            return await self.client.chat.completions.create(**kwargs)
+    
+    @_retry(max_attempts=3, base=1.0)
+    async def _stream_chat_completion(self, **kwargs) -> str:
+        """Streamed chat completion collected into the full message text.
         
-    def generate_test_cases(self, content: str, custom_instructions: str = "") -> List[Dict[str, Any]]:
-        """Enhanced test case generation with maker-checker validation"""
+        Tokens are consumed as they arrive, so the event loop keeps serving the other
+        in-flight requests instead of waiting on one large response body.
+        """
+        async with self._get_semaphore():
+            stream = await self.client.chat.completions.create(stream=True, **kwargs)
+            parts = []
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+        return "".join(parts)
+    
+    def close(self):
+        """Release the HTTP connection pool and the private event loop"""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self.client.close())
+            self._loop.close()
+        
+    async def generate_test_cases_async(self, content: str, custom_instructions: str = "",
+                                        mode: GenerationMode = "auto") -> List[Dict[str, Any]]:
+        """Enhanced test case generation with maker-checker validation.
+        
+        mode="auto" detects PACS.008 content. Callers that already know the document type
+        (e.g. a UI selector) pass "pacs008" or "standard" to skip detection; in auto mode,
+        custom instructions mentioning "pacs" or the word "standard" select the mode the same way.
+        """
         try:
-            # Clean and prepare content
-            cleaned_content = self._clean_content(content)
+            if mode == "auto":
+                mode = self._mode_from_instructions(custom_instructions)
             
-            # Check if content is PACS.008 related
-            is_pacs008 = self._is_pacs008_content(cleaned_content)
+            if mode == "pacs008":
+                # The model handles PACS.008 markup itself, so whitespace normalisation is enough
+                cleaned_content = self._normalize_whitespace(content)
+                is_pacs008 = True
+            else:
+                # Clean and prepare content
+                cleaned_content = self._clean_content(content)
+                
+                # Check if content is PACS.008 related
+                is_pacs008 = mode == "auto" and self._is_pacs008_content(cleaned_content)
             
             if is_pacs008 and self.maker_checker_enabled:
                 logger.info("Detected PACS.008 content - using enhanced maker-checker workflow")
-                return self._generate_pacs008_test_cases(cleaned_content, custom_instructions)
+                test_cases = await self._generate_pacs008_test_cases(cleaned_content, custom_instructions)
             else:
                 logger.info("Using standard test case generation")
-                return self._generate_standard_test_cases(cleaned_content, custom_instructions)
+                test_cases = await self._generate_standard_test_cases(cleaned_content, custom_instructions)
                 
         except Exception as e:
             logger.error(f"Error in enhanced test generation: {str(e)}")
-            return self._get_fallback_test_cases()
+            test_cases = self._get_fallback_test_cases()
+        
+        # Only the shared fallback constants arrive here as read-only tuples
+        return test_cases if isinstance(test_cases, list) else _thaw(test_cases)
+    
+    def generate_test_cases_batch(self, docs: List[Tuple[str, str]]) -> str:
+        """Submit (content, custom_instructions) pairs to the OpenAI Batch API; returns the batch id.
+        
+        Batch requests cost half as much and use a separate rate-limit pool, at the price of
+        up to 24h latency. Use collect_batch() to fetch the results.
+        """
+        return self._run_sync(self._submit_batch(docs))
+    
+    def collect_batch(self, batch_id: str, poll_interval: float = 30.0) -> Dict[str, List[Dict[str, Any]]]:
+        """Wait for a batch from generate_test_cases_batch() and return test cases per document id"""
+        return self._run_sync(self._collect_batch(batch_id, poll_interval))
+    
+    def _batch_requests(self, doc_id: str, content: str, custom_instructions: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """(custom_id, request body) pairs for one document, tagged "<doc_id>::<stage>" """
+        cleaned_content = self._clean_content(content)
+        
+        if self._is_pacs008_content(cleaned_content) and self.maker_checker_enabled:
+            # Test generation depends on the analysis output, so only the analysis is batched
+            return [(f"{doc_id}::analysis", self._unified_analysis_request(cleaned_content))]
+        
+        user_stories = self._extract_user_stories(cleaned_content)
+        if not user_stories:
+            user_stories = [{"id": "REQ001", "content": _truncate_tokens(cleaned_content, STORY_PROMPT_TOKENS)}]
+        return [(f"{doc_id}::story::{story['id']}", self._story_request(story, custom_instructions))
+                for story in user_stories]
+    
+    async def _submit_batch(self, docs: List[Tuple[str, str]]) -> str:
+        """Upload the JSONL request file and create the batch"""
+        lines = []
+        batch_docs = {}
+        for index, (content, custom_instructions) in enumerate(docs, 1):
+            doc_id = f"DOC{index:03d}"
+            batch_docs[doc_id] = (content, custom_instructions)
+            for custom_id, body in self._batch_requests(doc_id, content, custom_instructions):
+                lines.append(json.dumps({
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": body
+                }))
+        
+        batch_file = await self.client.files.create(
+            file=("test_generation_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        self._batch_docs[batch.id] = batch_docs
+        logger.info(f"📦 Submitted batch {batch.id} with {len(lines)} requests for {len(docs)} documents")
+        return batch.id
+    
+    async def _collect_batch(self, batch_id: str, poll_interval: float) -> Dict[str, List[Dict[str, Any]]]:
+        """Poll a batch until it finishes and turn its output into test cases per document"""
+        while True:
+            batch = await self.client.batches.retrieve(batch_id)
+            if batch.status in ("completed", "failed", "expired", "cancelled"):
+                break
+            logger.info(f"Batch {batch_id} is {batch.status}, checking again in {poll_interval:.0f}s")
+            await asyncio.sleep(poll_interval)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error(f"Batch {batch_id} finished with status {batch.status}")
+            return {}
+        
+        output = await self.client.files.content(batch.output_file_id)
+        batch_docs = self._batch_docs.get(batch_id, {})
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = _loads(line)
+            doc_id, stage = record["custom_id"].split("::", 1)
+            doc_cases = results.setdefault(doc_id, [])
+            
+            try:
+                message = record["response"]["body"]["choices"][0]["message"]["content"]
+                data = _parse_json(message)
+            except Exception as e:
+                logger.error(f"Batch result {record['custom_id']} unusable: {str(e)}")
+                data = None
+            
+            if stage == "analysis":
+                content, custom_instructions = batch_docs.get(doc_id, ("", ""))
+                doc_cases.extend(await self._tests_from_batch_analysis(data, content, custom_instructions))
+            else:
+                test_cases = data.get("results", data) if isinstance(data, dict) else data
+                if not isinstance(test_cases, list):
+                    story_id = stage.split("::", 1)[-1]
+                    test_cases = self._fallback_test_case_generation({"id": story_id, "content": ""})
+                doc_cases.extend(test_cases)
+        
+        return {doc_id: self._validate_and_enhance_test_cases(test_cases)
+                for doc_id, test_cases in results.items()}
+    
+    async def _tests_from_batch_analysis(self, data: Any, content: str,
+                                         custom_instructions: str) -> List[Dict[str, Any]]:
+        """Finish the PACS.008 workflow for a batched analysis with a real-time test generation call"""
+        analysis = self._check_unified_analysis(data)
+        if analysis is None:
+            if not content:
+                return self._get_fallback_test_cases()
+            analysis = await self._legacy_pacs008_analysis(self._clean_content(content))
+        return await self._tests_from_analysis(analysis, custom_instructions)
+    
+    def _mode_from_instructions(self, custom_instructions: str) -> GenerationMode:
+        """Generation mode declared by the custom instructions, "auto" if none"""
+        if _PACS_MODE_HINT_RE.search(custom_instructions):
+            return "pacs008"
+        if _STANDARD_MODE_HINT_RE.search(custom_instructions):
+            return "standard"
+        return "auto"
     
     def _is_pacs008_content(self, content: str) -> bool:
         """Detect if content is related to PACS.008"""
-        pacs008_indicators = [
-            "pacs.008", "pacs008", "FI to FI Customer Credit Transfer",
-            "Debtor Agent", "Creditor Agent", "Interbank Settlement",
-            "ISO 20022", "Business Application Header", "BAH",
-            "Group Header", "Credit Transfer Transaction Information"
-        ]
+        # One scan over the content that stops at the third distinct indicator
+        indicators_found = set()
+        for match in _PACS008_INDICATOR_RE.finditer(content):
+            indicators_found.add(match.group(0).lower())
+            if len(indicators_found) >= PACS008_INDICATOR_THRESHOLD:
+                return True
         
-        content_lower = content.lower()
-        indicators_found = sum(1 for indicator in pacs008_indicators 
-                             if indicator.lower() in content_lower)
-        
-        return indicators_found >= 3
+        return False
     
-    def _generate_pacs008_test_cases(self, content: str, custom_instructions: str) -> List[Dict[str, Any]]:
+    async def _generate_pacs008_test_cases(self, content: str, custom_instructions: str) -> List[Dict[str, Any]]:
         """Generate test cases using PACS.008 maker-checker workflow"""
         
-        # Step 1: Extract PACS.008 fields from document
-        logger.info("Extracting PACS.008 fields...")
-        pacs_fields = self._extract_pacs008_fields(content)
+        # Steps 1-3: fields, maker-checker validation and user stories in one round-trip
+        logger.info("Running unified PACS.008 analysis...")
+        analysis = await self._run_unified_pacs008_analysis(content)
         
-        # Step 2: Run maker-checker validation
-        logger.info("Running maker-checker validation...")
-        maker_checker_results = self._run_maker_checker_validation(pacs_fields)
+        if analysis is None:
+            logger.warning("Unified analysis unusable - falling back to per-step extraction")
+            analysis = await self._legacy_pacs008_analysis(content)
         
-        # Step 3: Extract user stories and acceptance criteria
-        logger.info("Extracting user stories...")
-        user_stories = self._extract_user_stories_with_context(content, pacs_fields)
+        return await self._tests_from_analysis(analysis, custom_instructions)
+    
+    async def _tests_from_analysis(self, analysis: Dict[str, Any], custom_instructions: str) -> List[Dict[str, Any]]:
+        """Generate test cases from a unified (or legacy) PACS.008 analysis"""
+        pacs_fields = analysis["fields"]
+        user_stories = analysis["user_stories"]
+        maker_checker_results = {
+            "maker_validations": analysis["maker_validations"],
+            "checker_response": analysis["checker_response"],
+            "original_fields": pacs_fields,
+            "validation_summary": self._create_validation_summary(
+                analysis["maker_validations"], analysis["checker_response"]
+            )
+        }
         
         # Step 4: Generate test cases based on validation results
         logger.info("Generating enhanced test cases...")
-        test_cases = self._generate_tests_from_validation_results(
+        test_cases = await self._generate_tests_from_validation_results(
             user_stories, 
             pacs_fields, 
             maker_checker_results, 
@@ -77,76 +641,135 @@ class EnhancedTestCaseGenerator:
         
         return test_cases
     
-    def _extract_pacs008_fields(self, content: str) -> Dict[str, Any]:
-        """Extract PACS.008 fields from document content"""
+    async def _run_unified_pacs008_analysis(self, content: str) -> Optional[Dict[str, Any]]:
+        """Extract fields, run maker and checker review and derive user stories in a single call.
         
-        extraction_prompt = f"""
-        You are a PACS.008 field extraction expert. Analyze this banking document and extract relevant pacs.008 message fields.
-
-        Document Content: {content[:3000]}...
-
-        Extract both explicit field values mentioned in the document AND create realistic example values for missing fields.
-
-        Return the field data in this exact JSON format:
-        {{
-            "message_identification": "extracted or realistic example",
-            "creation_date_time": "extracted or example ISO datetime",
-            "number_of_transactions": "extracted or example number",
-            "settlement_method": "extracted (INDA/INGA/CLRG.I/COVE) or example",
-            "instructing_agent_bic": "extracted or example BIC (8 or 11 chars)",
-            "instructed_agent_bic": "extracted or example BIC (8 or 11 chars)",
-            "interbank_settlement_amount": "extracted or example amount",
-            "settlement_currency": "extracted or example currency (USD/EUR/GBP)",
-            "interbank_settlement_date": "extracted or example date",
-            "instruction_identification": "extracted or example (max 16 chars)",
-            "end_to_end_identification": "extracted or example",
-            "uetr": "extracted or example UUID format",
-            "debtor_agent_bic": "extracted or example BIC",
-            "creditor_agent_bic": "extracted or example BIC", 
-            "debtor_account": "extracted or example account",
-            "creditor_account": "extracted or example account",
-            "charge_bearer": "extracted (DEBT/CRED/SHAR/SLEV) or example",
-            "remittance_information": "extracted or example"
-        }}
-
-        Use realistic banking data for examples (valid BIC formats, proper currencies, reasonable amounts).
+        Returns None when the response is not structurally valid, so the caller can use
+        the per-step _legacy_pacs008_analysis() instead.
         """
+        cache_key, cached = self._cached("unified_analysis", content)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = await self._create_chat_completion(**self._unified_analysis_request(content))
+            analysis = _parse_json(response.choices[0].message.content)
+            
+        except Exception as e:
+            logger.error(f"Unified PACS.008 analysis error: {str(e)}")
+            return None
+        
+        analysis = self._check_unified_analysis(analysis)
+        if analysis is not None:
+            self._cache.put(cache_key, _thaw(analysis))
+        return analysis
+    
+    def _unified_analysis_request(self, content: str) -> Dict[str, Any]:
+        """Chat completion parameters for the unified PACS.008 analysis"""
+        
+        unified_prompt = UNIFIED_ANALYSIS_PROMPT.substitute(
+            document=_truncate_tokens(content, FIELD_PROMPT_TOKENS),
+            field_names=", ".join(PACS008_EXTRACTION_FIELDS)
+        )
+        
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "You are an ISO 20022 PACS.008 analysis expert performing field extraction, maker validation, checker review and user story analysis. Return only valid JSON."},
+                {"role": "user", "content": unified_prompt}
+            ],
+            "response_format": JSON_OBJECT_FORMAT,
+            "temperature": 0.1,
+            "max_tokens": 5000
+        }
+    
+    def _check_unified_analysis(self, analysis: Any) -> Optional[Dict[str, Any]]:
+        """Validate the unified analysis structure and fill empty sections with defaults"""
+        
+        # Structural check - every section must be present with the expected type
+        expected_types = {
+            "fields": dict,
+            "maker_validations": list,
+            "checker_response": dict,
+            "user_stories": list
+        }
+        if not isinstance(analysis, dict) or not all(
+                isinstance(analysis.get(key), expected) for key, expected in expected_types.items()):
+            logger.warning("Unified PACS.008 analysis returned an unexpected structure")
+            return None
+        
+        if not analysis["fields"]:
+            analysis["fields"] = self._get_example_pacs_fields()
+        if not analysis["user_stories"]:
+            analysis["user_stories"] = self._get_default_user_stories()
+        
+        logger.info(f"Unified analysis: {len(analysis['fields'])} fields, "
+                    f"{len(analysis['maker_validations'])} maker validations, "
+                    f"checker {analysis['checker_response'].get('overall_status', 'Unknown')}, "
+                    f"{len(analysis['user_stories'])} user stories")
+        return analysis
+    
+    async def _legacy_pacs008_analysis(self, content: str) -> Dict[str, Any]:
+        """Per-step fallback for the unified analysis: one API call per step"""
+        
+        # Fields and user stories only depend on the document - extract them concurrently
+        user_stories_task = asyncio.ensure_future(
+            self._extract_user_stories_with_context(content, PACS008_EXTRACTION_FIELDS)
+        )
+        pacs_fields = await self._extract_pacs008_fields(content)
+        
+        # Maker-checker validation needs the extracted fields
+        validation = await self._run_maker_checker_validation(pacs_fields)
+        
+        return {
+            "fields": pacs_fields,
+            "maker_validations": validation["maker_validations"],
+            "checker_response": validation["checker_response"],
+            "user_stories": await user_stories_task
+        }
+    
+    async def _extract_pacs008_fields(self, content: str) -> Dict[str, Any]:
+        """Extract PACS.008 fields from document content"""
+        
+        cache_key, cached = self._cached("pacs008_fields", content)
+        if cached is not None:
+            return cached
+        
+        extraction_prompt = FIELD_EXTRACTION_PROMPT.substitute(document=_truncate_tokens(content, FIELD_PROMPT_TOKENS))
         
         try:
-            response = self.client.chat.completions.create(
+            response = await self._create_chat_completion(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a PACS.008 field extraction expert. Return only valid JSON with no additional text."},
                     {"role": "user", "content": extraction_prompt}
                 ],
+                response_format=JSON_OBJECT_FORMAT,
                 temperature=0.1,
                 max_tokens=1200
             )
             
-            response_text = response.choices[0].message.content.strip()
-            
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                extracted_fields = json.loads(json_match.group())
+            extracted_fields = _json_results(response)
+            if isinstance(extracted_fields, dict) and extracted_fields:
                 logger.info(f"Successfully extracted {len(extracted_fields)} PACS.008 fields")
+                self._cache.put(cache_key, extracted_fields)
                 return extracted_fields
             else:
-                logger.warning("No JSON found in field extraction response")
+                logger.warning("Unexpected JSON structure in field extraction response")
                 return self._get_example_pacs_fields()
                 
         except Exception as e:
             logger.error(f"PACS.008 field extraction error: {str(e)}")
             return self._get_example_pacs_fields()
     
-    def _run_maker_checker_validation(self, pacs_fields: Dict[str, Any]) -> Dict[str, Any]:
+    async def _run_maker_checker_validation(self, pacs_fields: Dict[str, Any]) -> Dict[str, Any]:
         """Run the complete maker-checker validation process"""
         
         # Step 1: Maker validation
-        maker_results = self._run_maker_validation(pacs_fields)
+        maker_results = await self._run_maker_validation(pacs_fields)
         
-        # Step 2: Checker validation
-        checker_results = self._run_checker_validation(maker_results)
+        # Step 2: Checker validation (reviews the maker's output, so stays sequential)
+        checker_results = await self._run_checker_validation(maker_results)
         
         return {
             "maker_validations": maker_results,
@@ -155,202 +778,102 @@ class EnhancedTestCaseGenerator:
             "validation_summary": self._create_validation_summary(maker_results, checker_results)
         }
     
-    def _run_maker_validation(self, pacs_fields: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _run_maker_validation(self, pacs_fields: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Simulate Maker role validation using GPT's ISO 20022 knowledge"""
         
-        maker_prompt = f"""
-You are an expert ISO 20022 Validator acting as the MAKER role in a banking system.
-You are validating a PACS.008 (FI to FI Customer Credit Transfer) message fields.
-
-Use your knowledge of ISO 20022 standards to validate each field:
-
-PACS.008 Message Fields:
-{json.dumps(pacs_fields, indent=2)}
-
-Perform comprehensive field-level validation:
-
-1. FORMAT VALIDATION:
-   - BIC codes: Must be 8 or 11 characters (e.g., DEUTDEFF or DEUTDEFFXXX)
-   - Currency codes: Must be valid ISO 4217 (USD, EUR, GBP, etc.)
-   - Amounts: Must be positive numbers with max 2 decimal places
-   - Dates: Must be valid ISO date format
-   - UUIDs: Must follow UUID v4 format
-
-2. BUSINESS LOGIC VALIDATION:
-   - Settlement amounts must be > 0
-   - Settlement method codes must be valid (INDA, INGA, CLRG.I, COVE)
-   - Charge bearer codes must be valid (DEBT, CRED, SHAR, SLEV)
-   - Instruction ID max 16 characters
-
-3. CONSISTENCY CHECKS:
-   - Debtor and Creditor agents should not be same for external transfers
-   - Currency consistency across amount fields
-   - Date logical consistency
-
-Return validation results as JSON array:
-[
-  {{
-    "field_name": "exact field name",
-    "field_value": "field value",
-    "validation_status": "Valid|Invalid|Missing|Suspicious",
-    "validation_reason": "specific technical reason",
-    "error_code": "BFSI error code if invalid",
-    "severity": "Critical|High|Medium|Low"
-  }}
-]
-
-Focus only on ISO 20022 PACS.008 compliance. Be specific about validation failures.
-"""
+        cache_key, cached = self._cached("maker_validation", pacs_fields)
+        if cached is not None:
+            return cached
+        
+        maker_prompt = MAKER_VALIDATION_PROMPT.substitute(pacs_fields=_compact_json(pacs_fields))
         
         try:
-            response = self.client.chat.completions.create(
+            response = await self._create_chat_completion(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are an ISO 20022 MAKER validator. Return only valid JSON array with specific validation results."},
+                    {"role": "system", "content": "You are an ISO 20022 MAKER validator. Return only valid JSON with specific validation results."},
                     {"role": "user", "content": maker_prompt}
                 ],
+                response_format=JSON_OBJECT_FORMAT,
                 temperature=0.1,
                 max_tokens=2000
             )
             
-            response_text = response.choices[0].message.content.strip()
-            
-            # Extract JSON array from response
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                maker_validations = json.loads(json_match.group())
+            maker_validations = _json_results(response)
+            if isinstance(maker_validations, list):
                 logger.info(f"Maker validation completed for {len(maker_validations)} fields")
+                self._cache.put(cache_key, maker_validations)
                 return maker_validations
             else:
-                logger.warning("No JSON array found in maker validation response")
+                logger.warning("Unexpected JSON structure in maker validation response")
                 return []
                 
         except Exception as e:
             logger.error(f"Maker validation error: {str(e)}")
             return []
     
-    def _run_checker_validation(self, maker_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _run_checker_validation(self, maker_results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Simulate Checker role validation and approval process"""
         
-        checker_prompt = f"""
-You are an ISO 20022 CHECKER reviewing the MAKER's validation of a PACS.008 message.
-
-Your responsibilities as Checker:
-1. Review all Maker validations
-2. Make business-level assessment
-3. Decide on approval/rejection
-4. Provide clear business reasoning
-
-MAKER'S VALIDATION RESULTS:
-{json.dumps(maker_results, indent=2)}
-
-Based on the Maker's findings, perform Checker review:
-
-1. RISK ASSESSMENT:
-   - Count critical vs minor issues
-   - Assess business impact of each issue
-   - Determine if message is processable
-
-2. BUSINESS DECISION:
-   - Approve: No critical issues, minor issues acceptable
-   - Reject: Critical issues present, cannot process
-   - Hold: Needs additional review or clarification
-
-3. AUDIT REQUIREMENTS:
-   - Document decision reasoning
-   - Provide specific feedback for rejected items
-   - Suggest corrective actions
-
-Return response in JSON format:
-{{
-  "overall_status": "Approved|Rejected|Hold|Review_Required",
-  "decision_summary": "clear business explanation",
-  "critical_issues_count": number,
-  "approval_conditions": ["condition1", "condition2"],
-  "checker_remarks": ["business remark 1", "business remark 2"],
-  "recommended_actions": ["action1", "action2"],
-  "business_risk_level": "Low|Medium|High|Critical",
-  "processing_authorization": "Authorized|Not_Authorized|Conditional"
-}}
-"""
+        cache_key, cached = self._cached("checker_validation", maker_results)
+        if cached is not None:
+            return cached
+        
+        checker_prompt = CHECKER_VALIDATION_PROMPT.substitute(maker_results=_compact_json(maker_results))
         
         try:
-            response = self.client.chat.completions.create(
+            response = await self._create_chat_completion(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are an ISO 20022 CHECKER making business decisions. Return only valid JSON."},
                     {"role": "user", "content": checker_prompt}
                 ],
+                response_format=JSON_OBJECT_FORMAT,
                 temperature=0.1,
                 max_tokens=1500
             )
             
-            response_text = response.choices[0].message.content.strip()
-            
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                checker_response = json.loads(json_match.group())
+            checker_response = _json_results(response)
+            if isinstance(checker_response, dict):
                 logger.info(f"Checker validation completed: {checker_response.get('overall_status', 'Unknown')}")
+                self._cache.put(cache_key, checker_response)
                 return checker_response
             else:
-                logger.warning("No JSON found in checker validation response")
+                logger.warning("Unexpected JSON structure in checker validation response")
                 return {"overall_status": "Error", "decision_summary": "Checker validation failed"}
                 
         except Exception as e:
             logger.error(f"Checker validation error: {str(e)}")
             return {"overall_status": "Error", "decision_summary": f"Checker error: {str(e)}"}
     
-    def _extract_user_stories_with_context(self, content: str, pacs_fields: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _extract_user_stories_with_context(self, content: str, field_names) -> List[Dict[str, Any]]:
         """Extract user stories with PACS.008 context"""
         
-        user_story_prompt = f"""
-        Analyze this PACS.008 banking document and extract or infer User Stories with Acceptance Criteria.
-
-        Document Content: {content[:2000]}...
+        cache_key, cached = self._cached("user_stories", content, list(field_names))
+        if cached is not None:
+            return cached
         
-        PACS.008 Fields Identified: {list(pacs_fields.keys())}
-
-        Extract or create realistic User Stories that would lead to PACS.008 message processing tests.
-
-        Return in JSON format:
-        [
-          {{
-            "user_story_id": "US001",
-            "user_story": "As a [role], I want [goal] so that [benefit]",
-            "business_context": "how this relates to PACS.008 processing",
-            "acceptance_criteria": [
-              {{
-                "ac_id": "AC001",
-                "ac_description": "specific testable requirement",
-                "pacs008_fields": ["relevant field names"],
-                "validation_focus": "what should be validated",
-                "test_scenarios": ["scenario1", "scenario2"]
-              }}
-            ]
-          }}
-        ]
-
-        Focus on banking workflows like payment creation, validation, approval, processing.
-        """
+        user_story_prompt = USER_STORY_PROMPT.substitute(
+            document=_truncate_tokens(content, STORY_PROMPT_TOKENS),
+            field_names=list(field_names)
+        )
         
         try:
-            response = self.client.chat.completions.create(
+            response = await self._create_chat_completion(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are a BFSI business analyst. Extract realistic user stories for PACS.008 workflows."},
+                    {"role": "system", "content": "You are a BFSI business analyst. Extract realistic user stories for PACS.008 workflows. Return only valid JSON."},
                     {"role": "user", "content": user_story_prompt}
                 ],
+                response_format=JSON_OBJECT_FORMAT,
                 temperature=0.2,
                 max_tokens=2000
             )
             
-            response_text = response.choices[0].message.content.strip()
-            
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                user_stories = json.loads(json_match.group())
+            user_stories = _json_results(response)
+            if isinstance(user_stories, list) and user_stories:
                 logger.info(f"Extracted {len(user_stories)} user stories with PACS.008 context")
+                self._cache.put(cache_key, user_stories)
                 return user_stories
             else:
                 return self._get_default_user_stories()
@@ -359,97 +882,42 @@ Return response in JSON format:
             logger.error(f"User story extraction error: {str(e)}")
             return self._get_default_user_stories()
     
-    def _generate_tests_from_validation_results(self, user_stories: List[Dict[str, Any]], 
+    async def _generate_tests_from_validation_results(self, user_stories: List[Dict[str, Any]], 
                                                pacs_fields: Dict[str, Any],
                                                validation_results: Dict[str, Any], 
                                                custom_instructions: str) -> List[Dict[str, Any]]:
         """Generate comprehensive test cases based on maker-checker validation results"""
         
-        test_generation_prompt = f"""
-You are an expert BFSI test engineer generating test cases for PACS.008 message processing with Maker-Checker workflow.
-
-USER STORIES CONTEXT:
-{json.dumps(user_stories, indent=2)}
-
-PACS.008 FIELDS:
-{json.dumps(pacs_fields, indent=2)}
-
-MAKER VALIDATION RESULTS:
-{json.dumps(validation_results.get('maker_validations', []), indent=2)}
-
-CHECKER VALIDATION RESULTS:
-{json.dumps(validation_results.get('checker_response', {}), indent=2)}
-
-CUSTOM INSTRUCTIONS: {custom_instructions}
-
-Generate comprehensive test cases covering:
-
-1. MAKER WORKFLOW TESTS:
-   - Field validation for each PACS.008 field
-   - Format validation (BIC, IBAN, currency, amount)
-   - Business rule validation
-   - Error handling scenarios
-
-2. CHECKER WORKFLOW TESTS:
-   - Review and approval processes
-   - Rejection scenarios with specific reasons
-   - Business rule verification
-   - Risk assessment validation
-
-3. END-TO-END WORKFLOW TESTS:
-   - Complete maker-checker-processing cycle
-   - Integration testing scenarios
-   - Error recovery workflows
-
-4. FIELD-SPECIFIC TESTS:
-   - Based on validation issues found by Maker/Checker
-   - Boundary testing for amounts and dates
-   - Format validation for each field type
-
-Each test case must:
-- Reference specific PACS.008 fields being tested
-- Include realistic banking data (valid BICs, IBANs, amounts)
-- Specify Maker or Checker role clearly
-- Include expected validation messages
-- Map to specific User Stories and Acceptance Criteria
-
-Generate exactly 15 comprehensive test cases in this format:
-[
-  {{
-    "User Story ID": "user_story_id from context",
-    "Acceptance Criteria ID": "ac_id from context",
-    "Scenario": "descriptive scenario name",
-    "Test Case ID": "TC001",
-    "Test Case Description": "specific description mentioning PACS.008 fields and roles",
-    "Precondition": "system state and user role",
-    "Steps": "detailed numbered steps with actual field names, values, and expected validations",
-    "Expected Result": "specific validation outcome and business result",
-    "Part of Regression": "Yes|No",
-    "Priority": "High|Medium|Low",
-    "Role_Focus": "Maker|Checker|End-to-End",
-    "PACS008_Fields_Tested": ["field names"],
-    "Validation_Type": "Format|Business_Rule|Workflow|Integration"
-  }}
-]
-"""
+        maker_findings = [
+            {key: result[key] for key in TEST_PROMPT_MAKER_KEYS if key in result}
+            for result in validation_results.get('maker_validations', []) if isinstance(result, dict)
+        ]
+        checker_response = validation_results.get('checker_response', {})
+        checker_decision = {key: checker_response[key] for key in TEST_PROMPT_CHECKER_KEYS
+                            if key in checker_response}
+        
+        test_generation_prompt = VALIDATION_TEST_PROMPT.substitute(
+            user_stories=_compact_json(user_stories),
+            pacs_fields=_compact_json(pacs_fields),
+            maker_findings=_compact_json(maker_findings),
+            checker_decision=_compact_json(checker_decision),
+            custom_instructions=custom_instructions
+        )
         
         try:
-            response = self.client.chat.completions.create(
+            response_text = await self._stream_chat_completion(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are an expert BFSI test engineer. Generate realistic, specific, executable test cases based on PACS.008 validation results."},
+                    {"role": "system", "content": "You are an expert BFSI test engineer. Generate realistic, specific, executable test cases based on PACS.008 validation results. Return only valid JSON."},
                     {"role": "user", "content": test_generation_prompt}
                 ],
+                response_format=JSON_OBJECT_FORMAT,
                 temperature=0.2,
                 max_tokens=4000
             )
             
-            response_text = response.choices[0].message.content.strip()
-            
-            # Extract JSON array from response
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                test_cases = json.loads(json_match.group())
+            test_cases = await _decode_results_async(response_text)
+            if isinstance(test_cases, list):
                 
                 # Validate and enhance test cases
                 validated_test_cases = self._validate_and_enhance_test_cases(test_cases)
@@ -457,55 +925,112 @@ Generate exactly 15 comprehensive test cases in this format:
                 logger.info(f"Generated {len(validated_test_cases)} enhanced test cases")
                 return validated_test_cases
             else:
-                logger.warning("No JSON array found in test generation response")
+                logger.warning("Unexpected JSON structure in test generation response")
                 return self._get_fallback_test_cases()
                 
         except Exception as e:
             logger.error(f"Test generation from validation results error: {str(e)}")
             return self._get_fallback_test_cases()
     
-    def _generate_standard_test_cases(self, content: str, custom_instructions: str) -> List[Dict[str, Any]]:
+    async def _generate_standard_test_cases(self, content: str, custom_instructions: str) -> List[Dict[str, Any]]:
         """Generate standard test cases for non-PACS.008 content"""
         
         # Extract user stories using existing logic
         user_stories = self._extract_user_stories(content)
         
         if not user_stories:
-            user_stories = [{"id": "REQ001", "content": content[:2000]}]
+            user_stories = [{"id": "REQ001", "content": _truncate_tokens(content, STORY_PROMPT_TOKENS)}]
         
-        all_test_cases = []
+        # Several stories share one request (one RPM charge, one system prompt); the
+        # groups are independent, so request them concurrently (bounded by the semaphore)
+        groups = [user_stories[i:i + STORIES_PER_REQUEST]
+                  for i in range(0, len(user_stories), STORIES_PER_REQUEST)]
+        results = await asyncio.gather(
+            *(self._generate_test_cases_for_stories_batched(group, custom_instructions) for group in groups),
+            return_exceptions=True
+        )
         
-        for story in user_stories:
-            test_cases = self._generate_test_cases_for_story(story, custom_instructions)
-            all_test_cases.extend(test_cases)
+        all_test_cases = []
+        for group, group_results in zip(groups, results):
+            if isinstance(group_results, BaseException):
+                logger.error(f"Test case generation error for {[story['id'] for story in group]}: "
+                             f"{str(group_results)}")
+                group_results = [self._fallback_test_case_generation(story) for story in group]
+            for test_cases in group_results:
+                all_test_cases.extend(test_cases)
         
         return self._validate_and_enhance_test_cases(all_test_cases)
     
+    async def _generate_test_cases_for_stories_batched(self, stories: List[Dict[str, str]],
+                                                       custom_instructions: str) -> List[List[Dict[str, Any]]]:
+        """Generate test cases for several stories with one request; one list per story, in order.
+        
+        Falls back to _generate_test_cases_for_story() if the combined answer does not line up
+        with the stories.
+        """
+        if len(stories) == 1:
+            return [await self._generate_test_cases_for_story(stories[0], custom_instructions)]
+        
+        prompt = MULTI_STORY_TEST_PROMPT.substitute(
+            stories=_compact_json([{"id": story['id'], "content": story['content']} for story in stories]),
+            custom_instructions=custom_instructions,
+            num_cases=self._requested_case_count(custom_instructions),
+            story_count=len(stories)
+        )
+        
+        try:
+            response_text = await self._stream_chat_completion(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": "You are an expert BFSI test engineer. Respond with ONLY valid JSON."},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format=JSON_OBJECT_FORMAT,
+                temperature=0.1,
+                max_tokens=3000 * len(stories)
+            )
+            
+            per_story = await _decode_results_async(response_text)
+            if (isinstance(per_story, list) and len(per_story) == len(stories)
+                    and all(isinstance(test_cases, list) for test_cases in per_story)):
+                return per_story
+            logger.warning(f"Combined answer for {len(stories)} stories did not line up - "
+                           f"requesting them one by one")
+                
+        except Exception as e:
+            logger.error(f"Combined test case generation error: {str(e)}")
+        
+        return list(await asyncio.gather(
+            *(self._generate_test_cases_for_story(story, custom_instructions) for story in stories)
+        ))
+    
     # Helper methods and existing logic...
+    def _normalize_whitespace(self, content: str) -> str:
+        """Cheaper _clean_content for known PACS.008 input: collapse whitespace and truncate only"""
+        content = _WS_RE.sub(' ', content)
+        truncated = _truncate_tokens(content, CONTENT_TOKEN_LIMIT)
+        if len(truncated) < len(content):
+            content = truncated + "..."
+        return content.strip()
+    
     def _clean_content(self, content: str) -> str:
         """Clean and normalize content for processing"""
-        content = re.sub(r'\s+', ' ', content)
-        content = re.sub(r'[^\w\s\-\.\,\:\;\(\)\[\]\"\'\/\@\#\$\%\&\*\+\=\<\>\?]', ' ', content)
+        content = _WS_RE.sub(' ', content)
         
-        if len(content) > 8000:
-            content = content[:8000] + "..."
+        # Truncate before translating so only the kept prefix is filtered
+        truncated = _truncate_tokens(content, CONTENT_TOKEN_LIMIT)
+        if len(truncated) < len(content):
+            content = truncated + "..."
         
-        return content.strip()
+        return content.translate(_CLEAN_TABLE).strip()
     
     def _extract_user_stories(self, content: str) -> List[Dict[str, str]]:
         """Extract user stories from content (existing logic)"""
         user_stories = []
         
-        story_patterns = [
-            r'(?:As\s+(?:a|an)\s+.+?I\s+want\s+.+?(?:so\s+that|in\s+order\s+to).+?)(?=As\s+(?:a|an)|$)',
-            r'(?:User\s+Story\s*:?\s*.+?)(?=User\s+Story|$)',
-            r'(?:Given\s+.+?When\s+.+?Then\s+.+?)(?=Given|$)',
-            r'(?:Scenario\s*:?\s*.+?)(?=Scenario|$)'
-        ]
-        
         story_id = 1
-        for pattern in story_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE | re.DOTALL)
+        for pattern in _STORY_PATTERNS:
+            matches = pattern.findall(content)
             for match in matches:
                 if len(match.strip()) > 20:
                     user_stories.append({
@@ -515,74 +1040,48 @@ Generate exactly 15 comprehensive test cases in this format:
                     story_id += 1
         
         if not user_stories:
-            sections = self._split_into_sections(content)
-            for i, section in enumerate(sections, 1):
-                if len(section.strip()) > 50:
-                    user_stories.append({
-                        "id": f"REQ{i:03d}",
-                        "content": section.strip()
-                    })
+            # Sections are produced lazily, so nothing past the tenth usable one is sliced out
+            numbered_sections = ((i, section.strip()) for i, section in enumerate(self._iter_sections(content), 1))
+            usable_sections = ((i, section) for i, section in numbered_sections if len(section) > 50)
+            for i, section in itertools.islice(usable_sections, 10):
+                user_stories.append({
+                    "id": f"REQ{i:03d}",
+                    "content": section
+                })
         
         return user_stories[:10]
     
-    def _split_into_sections(self, content: str) -> List[str]:
-        """Split content into logical sections"""
-        header_split = re.split(r'\n(?=\d+\.|[A-Z][A-Z\s]+:|\#|\*)', content)
-        if len(header_split) > 1:
-            return header_split
-        else:
-            paragraphs = content.split('\n\n')
-            return [p for p in paragraphs if len(p.strip()) > 100]
-    
-    def _generate_test_cases_for_story(self, story: Dict[str, str], custom_instructions: str) -> List[Dict[str, Any]]:
-        """Generate test cases for a single user story (existing logic)"""
-        
-        num_cases = 8  # default
-        if "exactly" in custom_instructions:
-            match = re.search(r'exactly (\d+) test cases', custom_instructions)
-            if match:
-                num_cases = int(match.group(1))
+    def _iter_sections(self, content: str) -> Iterator[str]:
+        """Split content into logical sections: at header lines, else at paragraphs over 100 chars"""
+        boundaries = _SECTION_SPLIT_RE.finditer(content)
+        first = next(boundaries, None)
         
-        prompt = f"""
-You are an expert BFSI test engineer. Generate test cases from the provided requirement.
-
-User Story/Requirement: {story['content']}
-Custom Instructions: {custom_instructions}
-
-Generate EXACTLY {num_cases} test cases with these fields:
-1. User Story ID: {story['id']}
-2. Acceptance Criteria ID: Generate as AC001, AC002, etc.
-3. Scenario: Brief scenario name
-4. Test Case ID: Generate unique sequential IDs (TC001, TC002, etc.)
-5. Test Case Description: Clear one-line description
-6. Precondition: Prerequisites for test execution
-7. Steps: Detailed numbered steps (use \\n for line breaks)
-8. Expected Result: Clear expected outcome
-9. Part of Regression: "Yes" for critical functionality, "No" for edge cases
-10. Priority: "High" for happy path, "Medium" for validations, "Low" for edge cases
-
-Include positive scenarios, negative scenarios, and edge cases.
-Use realistic BFSI data (IBANs, amounts, dates, etc.)
-
-Output as JSON array only.
-"""
+        if first is not None:
+            start = 0
+            for boundary in itertools.chain((first,), boundaries):
+                yield content[start:boundary.start()]
+                start = boundary.end()
+            yield content[start:]
+            return
         
+        start = 0
+        while True:
+            end = content.find('\n\n', start)
+            paragraph = content[start:] if end < 0 else content[start:end]
+            if len(paragraph.strip()) > 100:
+                yield paragraph
+            if end < 0:
+                return
+            start = end + 2
+    
+    async def _generate_test_cases_for_story(self, story: Dict[str, str], custom_instructions: str) -> List[Dict[str, Any]]:
+        """Generate test cases for a single user story (existing logic)"""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert BFSI test engineer. Respond with ONLY valid JSON array."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=3000
-            )
-            
-            response_text = response.choices[0].message.content.strip()
+            response_text = await self._stream_chat_completion(**self._story_request(story, custom_instructions))
             
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
+            test_cases = await _decode_results_async(response_text)
+            if isinstance(test_cases, list):
+                return test_cases
             else:
                 return self._fallback_test_case_generation(story)
                 
@@ -590,55 +1089,68 @@ Output as JSON array only.
             logger.error(f"Test case generation error: {str(e)}")
             return self._fallback_test_case_generation(story)
     
+    def _requested_case_count(self, custom_instructions: str) -> int:
+        """Test cases per story: 'exactly N test cases' in the instructions, else 8"""
+        num_cases = 8  # default
+        if "exactly" in custom_instructions:
+            match = _EXACT_COUNT_RE.search(custom_instructions)
+            if match:
+                num_cases = int(match.group(1))
+        return num_cases
+    
+    def _story_request(self, story: Dict[str, str], custom_instructions: str) -> Dict[str, Any]:
+        """Chat completion parameters for generating one story's test cases"""
+        
+        prompt = STORY_TEST_PROMPT.substitute(
+            requirement=story['content'],
+            custom_instructions=custom_instructions,
+            num_cases=self._requested_case_count(custom_instructions),
+            story_id=story['id']
+        )
+        
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "You are an expert BFSI test engineer. Respond with ONLY valid JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            "response_format": JSON_OBJECT_FORMAT,
+            "temperature": 0.1,
+            "max_tokens": 3000
+        }
+    
     def _validate_and_enhance_test_cases(self, test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Validate and enhance generated test cases"""
         validated_cases = []
-        required_fields = [
-            "User Story ID", "Acceptance Criteria ID", "Scenario", "Test Case ID",
-            "Test Case Description", "Precondition", "Steps", "Expected Result",
-            "Part of Regression", "Priority"
-        ]
-        
         tc_counter = 1
-        ac_counter = 1
         
         for case in test_cases:
             try:
-                validated_case = {}
-                for field in required_fields:
-                    validated_case[field] = case.get(field, "").strip()
+                validated_case = {field: (case.get(field) or "").strip() for field in self.REQUIRED_FIELDS}
                 
-                # Auto-generate missing IDs
+                # Validate critical fields
+                if len(validated_case["Test Case Description"]) < 10 or len(validated_case["Steps"]) < 10:
+                    continue
+                
+                # Auto-generate missing IDs; acceptance criteria advance every third accepted case
                 if not validated_case["Test Case ID"]:
                     validated_case["Test Case ID"] = f"TC{tc_counter:03d}"
                 
                 if not validated_case["Acceptance Criteria ID"]:
-                    validated_case["Acceptance Criteria ID"] = f"AC{ac_counter:03d}"
-                
-                # Validate critical fields
-                if len(validated_case["Test Case Description"]) < 10:
-                    continue
-                
-                if len(validated_case["Steps"]) < 10:
-                    continue
+                    validated_case["Acceptance Criteria ID"] = f"AC{1 + tc_counter // 3:03d}"
                 
                 # Ensure proper values
-                if validated_case["Part of Regression"] not in ["Yes", "No"]:
+                if validated_case["Part of Regression"] not in ("Yes", "No"):
                     validated_case["Part of Regression"] = "No"
                 
-                if validated_case["Priority"] not in ["High", "Medium", "Low"]:
+                if validated_case["Priority"] not in ("High", "Medium", "Low"):
                     validated_case["Priority"] = "Medium"
                 
                 # Add enhanced fields if present
-                for extra_field in ["Role_Focus", "PACS008_Fields_Tested", "Validation_Type"]:
-                    if extra_field in case:
-                        validated_case[extra_field] = case[extra_field]
+                validated_case.update({field: _thaw(case[field]) for field in self.ENHANCED_FIELDS if field in case})
                 
                 validated_cases.append(validated_case)
                 tc_counter += 1
-                
-                if tc_counter % 3 == 0:
-                    ac_counter += 1
                     
             except Exception as e:
                 logger.warning(f"Skipping invalid test case: {str(e)}")
@@ -646,96 +1158,17 @@ Output as JSON array only.
         
         return validated_cases
     
-    def _get_example_pacs_fields(self) -> Dict[str, Any]:
-        """Fallback example PACS.008 fields"""
-        return {
-            "message_identification": "MSG20250803001",
-            "creation_date_time": "2025-08-03T10:30:00Z",
-            "number_of_transactions": "1",
-            "settlement_method": "INDA",
-            "instructing_agent_bic": "BANKAUAAXXX",
-            "instructed_agent_bic": "BANKUSBBXXX",
-            "interbank_settlement_amount": "565000.00",
-            "settlement_currency": "USD",
-            "interbank_settlement_date": "2025-08-03",
-            "instruction_identification": "INSTR123456789012",
-            "end_to_end_identification": "CORPORATIONXENDTOENDID",
-            "uetr": "d0b7077f-49fb-42ed-b78d-af331c0e5012",
-            "debtor_agent_bic": "BANKAUAAXXX",
-            "creditor_agent_bic": "BANKGBCCXXX",
-            "debtor_account": "123456789",
-            "creditor_account": "GB11111111111111111111",
-            "charge_bearer": "DEBT",
-            "remittance_information": "Contract 123"
-        }
+    def _get_example_pacs_fields(self) -> Mapping[str, Any]:
+        """Fallback example PACS.008 fields (shared, read-only)"""
+        return EXAMPLE_PACS_FIELDS
     
-    def _get_default_user_stories(self) -> List[Dict[str, Any]]:
-        """Default user stories for PACS.008"""
-        return [
-            {
-                "user_story_id": "US001",
-                "user_story": "As a Bank Officer, I want to create valid PACS.008 messages so that interbank payments are processed correctly",
-                "business_context": "PACS.008 message creation and validation for interbank transfers",
-                "acceptance_criteria": [
-                    {
-                        "ac_id": "AC001",
-                        "ac_description": "PACS.008 message must contain all mandatory fields with valid formats",
-                        "pacs008_fields": ["message_identification", "instructing_agent_bic", "instructed_agent_bic"],
-                        "validation_focus": "mandatory field presence and format validation",
-                        "test_scenarios": ["valid creation", "missing field validation", "invalid format rejection"]
-                    }
-                ]
-            },
-            {
-                "user_story_id": "US002",
-                "user_story": "As a Checker, I want to review and approve PACS.008 messages so that only valid payments are processed",
-                "business_context": "Maker-checker workflow for PACS.008 message approval",
-                "acceptance_criteria": [
-                    {
-                        "ac_id": "AC002",
-                        "ac_description": "Checker must validate business rules before approving PACS.008 messages",
-                        "pacs008_fields": ["interbank_settlement_amount", "charge_bearer", "settlement_method"],
-                        "validation_focus": "business rule validation and approval workflow",
-                        "test_scenarios": ["approval process", "rejection with reasons", "business rule verification"]
-                    }
-                ]
-            }
-        ]
+    def _get_default_user_stories(self) -> Sequence[Mapping[str, Any]]:
+        """Default user stories for PACS.008 (shared, read-only)"""
+        return DEFAULT_USER_STORIES
     
-    def _get_fallback_test_cases(self) -> List[Dict[str, Any]]:
-        """Fallback test cases when AI generation fails"""
-        return [
-            {
-                "User Story ID": "US001",
-                "Acceptance Criteria ID": "AC001",
-                "Scenario": "PACS.008 Message Creation",
-                "Test Case ID": "TC001",
-                "Test Case Description": "Verify successful PACS.008 message creation with valid mandatory fields",
-                "Precondition": "User logged in as Maker role with appropriate permissions",
-                "Steps": "1. Navigate to PACS.008 message creation\n2. Enter Message ID: MSG20250803001\n3. Enter Instructing Agent BIC: BANKAUAAXXX\n4. Enter Instructed Agent BIC: BANKUSBBXXX\n5. Enter Settlement Amount: 100000.00 USD\n6. Submit for validation",
-                "Expected Result": "PACS.008 message created successfully and submitted for checker approval",
-                "Part of Regression": "Yes",
-                "Priority": "High",
-                "Role_Focus": "Maker",
-                "PACS008_Fields_Tested": ["message_identification", "instructing_agent_bic", "instructed_agent_bic", "interbank_settlement_amount"],
-                "Validation_Type": "Format"
-            },
-            {
-                "User Story ID": "US001",
-                "Acceptance Criteria ID": "AC001",
-                "Scenario": "Invalid BIC Format Validation",
-                "Test Case ID": "TC002",
-                "Test Case Description": "Verify PACS.008 rejects invalid BIC format in Instructing Agent field",
-                "Precondition": "User logged in as Maker role",
-                "Steps": "1. Navigate to PACS.008 message creation\n2. Enter valid Message ID\n3. Enter invalid Instructing Agent BIC: INVALID123\n4. Enter valid Instructed Agent BIC\n5. Attempt to submit",
-                "Expected Result": "Validation error displayed: 'Invalid BIC format for Instructing Agent'",
-                "Part of Regression": "Yes",
-                "Priority": "High",
-                "Role_Focus": "Maker",
-                "PACS008_Fields_Tested": ["instructing_agent_bic"],
-                "Validation_Type": "Format"
-            }
-        ]
+    def _get_fallback_test_cases(self) -> Sequence[Mapping[str, Any]]:
+        """Fallback test cases when AI generation fails (shared, read-only; _thaw() before returning to callers)"""
+        return FALLBACK_TEST_CASES
     
     def _fallback_test_case_generation(self, story: Dict[str, str]) -> List[Dict[str, Any]]:
         """Generate basic test cases when AI parsing fails"""
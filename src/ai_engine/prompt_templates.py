@@ -0,0 +1,357 @@
+# src/ai_engine/prompt_templates.py
+"""Prompt templates for EnhancedTestCaseGenerator.
+
+The static instruction text is built once at import; each call only substitutes its
+payload. Keeping the long static part byte-identical across calls also lets the API
+reuse its prompt prefix cache.
+"""
+from string import Template
+
+# Unified PACS.008 analysis: fields, maker, checker and user stories in one response
+UNIFIED_ANALYSIS_PROMPT = Template("""
+You are analysing a PACS.008 (FI to FI Customer Credit Transfer) banking document.
+Perform ALL of the following steps and return them together in one JSON object.
+
+Document Content: ${document}...
+
+STEP 1 - FIELD EXTRACTION ("fields"):
+Extract explicit field values from the document AND create realistic example values for missing fields,
+for exactly these keys: ${field_names}.
+Use realistic banking data (valid BIC formats, proper currencies, reasonable amounts).
+
+STEP 2 - MAKER VALIDATION ("maker_validations"):
+Acting as the ISO 20022 MAKER, validate each extracted field:
+- Format: BIC 8 or 11 characters, ISO 4217 currency, positive amounts with max 2 decimals,
+  ISO dates, UUID v4 UETR
+- Business logic: settlement amount > 0, settlement method INDA/INGA/CLRG/COVE,
+  charge bearer DEBT/CRED/SHAR/SLEV, instruction ID max 16 characters
+- Consistency: debtor and creditor agents differ for external transfers, currency and date consistency
+
+STEP 3 - CHECKER REVIEW ("checker_response"):
+Acting as the ISO 20022 CHECKER, review the maker's findings, assess risk and decide
+Approved / Rejected / Hold / Review_Required with business reasoning.
+
+STEP 4 - USER STORIES ("user_stories"):
+Extract or infer User Stories with Acceptance Criteria that lead to PACS.008 processing tests
+(payment creation, validation, approval, processing).
+
+Return ONLY this JSON object:
+{
+  "fields": {"message_identification": "value", "...": "..."},
+  "maker_validations": [
+    {
+      "field_name": "exact field name",
+      "field_value": "field value",
+      "validation_status": "Valid|Invalid|Missing|Suspicious",
+      "validation_reason": "specific technical reason",
+      "error_code": "BFSI error code if invalid",
+      "severity": "Critical|High|Medium|Low"
+    }
+  ],
+  "checker_response": {
+    "overall_status": "Approved|Rejected|Hold|Review_Required",
+    "decision_summary": "clear business explanation",
+    "critical_issues_count": 0,
+    "approval_conditions": ["condition1"],
+    "checker_remarks": ["business remark 1"],
+    "recommended_actions": ["action1"],
+    "business_risk_level": "Low|Medium|High|Critical",
+    "processing_authorization": "Authorized|Not_Authorized|Conditional"
+  },
+  "user_stories": [
+    {
+      "user_story_id": "US001",
+      "user_story": "As a [role], I want [goal] so that [benefit]",
+      "business_context": "how this relates to PACS.008 processing",
+      "acceptance_criteria": [
+        {
+          "ac_id": "AC001",
+          "ac_description": "specific testable requirement",
+          "pacs008_fields": ["relevant field names"],
+          "validation_focus": "what should be validated",
+          "test_scenarios": ["scenario1", "scenario2"]
+        }
+      ]
+    }
+  ]
+}
+""")
+
+# PACS.008 field extraction
+FIELD_EXTRACTION_PROMPT = Template("""
+        You are a PACS.008 field extraction expert. Analyze this banking document and extract relevant pacs.008 message fields.
+
+        Document Content: ${document}...
+
+        Extract both explicit field values mentioned in the document AND create realistic example values for missing fields.
+
+        Return the field data in this exact JSON format:
+        {
+            "message_identification": "extracted or realistic example",
+            "creation_date_time": "extracted or example ISO datetime",
+            "number_of_transactions": "extracted or example number",
+            "settlement_method": "extracted (INDA/INGA/CLRG.I/COVE) or example",
+            "instructing_agent_bic": "extracted or example BIC (8 or 11 chars)",
+            "instructed_agent_bic": "extracted or example BIC (8 or 11 chars)",
+            "interbank_settlement_amount": "extracted or example amount",
+            "settlement_currency": "extracted or example currency (USD/EUR/GBP)",
+            "interbank_settlement_date": "extracted or example date",
+            "instruction_identification": "extracted or example (max 16 chars)",
+            "end_to_end_identification": "extracted or example",
+            "uetr": "extracted or example UUID format",
+            "debtor_agent_bic": "extracted or example BIC",
+            "creditor_agent_bic": "extracted or example BIC", 
+            "debtor_account": "extracted or example account",
+            "creditor_account": "extracted or example account",
+            "charge_bearer": "extracted (DEBT/CRED/SHAR/SLEV) or example",
+            "remittance_information": "extracted or example"
+        }
+
+        Use realistic banking data for examples (valid BIC formats, proper currencies, reasonable amounts).
+        """)
+
+# Maker role field validation
+MAKER_VALIDATION_PROMPT = Template("""
+You are an expert ISO 20022 Validator acting as the MAKER role in a banking system.
+You are validating a PACS.008 (FI to FI Customer Credit Transfer) message fields.
+
+Use your knowledge of ISO 20022 standards to validate each field:
+
+PACS.008 Message Fields:
+${pacs_fields}
+
+Perform comprehensive field-level validation:
+
+1. FORMAT VALIDATION:
+   - BIC codes: Must be 8 or 11 characters (e.g., DEUTDEFF or DEUTDEFFXXX)
+   - Currency codes: Must be valid ISO 4217 (USD, EUR, GBP, etc.)
+   - Amounts: Must be positive numbers with max 2 decimal places
+   - Dates: Must be valid ISO date format
+   - UUIDs: Must follow UUID v4 format
+
+2. BUSINESS LOGIC VALIDATION:
+   - Settlement amounts must be > 0
+   - Settlement method codes must be valid (INDA, INGA, CLRG.I, COVE)
+   - Charge bearer codes must be valid (DEBT, CRED, SHAR, SLEV)
+   - Instruction ID max 16 characters
+
+3. CONSISTENCY CHECKS:
+   - Debtor and Creditor agents should not be same for external transfers
+   - Currency consistency across amount fields
+   - Date logical consistency
+
+Return validation results as a JSON object with a "results" array:
+{
+  "results": [
+    {
+      "field_name": "exact field name",
+      "field_value": "field value",
+      "validation_status": "Valid|Invalid|Missing|Suspicious",
+      "validation_reason": "specific technical reason",
+      "error_code": "BFSI error code if invalid",
+      "severity": "Critical|High|Medium|Low"
+    }
+  ]
+}
+
+Focus only on ISO 20022 PACS.008 compliance. Be specific about validation failures.
+""")
+
+# Checker role review of the maker findings
+CHECKER_VALIDATION_PROMPT = Template("""
+You are an ISO 20022 CHECKER reviewing the MAKER's validation of a PACS.008 message.
+
+Your responsibilities as Checker:
+1. Review all Maker validations
+2. Make business-level assessment
+3. Decide on approval/rejection
+4. Provide clear business reasoning
+
+MAKER'S VALIDATION RESULTS:
+${maker_results}
+
+Based on the Maker's findings, perform Checker review:
+
+1. RISK ASSESSMENT:
+   - Count critical vs minor issues
+   - Assess business impact of each issue
+   - Determine if message is processable
+
+2. BUSINESS DECISION:
+   - Approve: No critical issues, minor issues acceptable
+   - Reject: Critical issues present, cannot process
+   - Hold: Needs additional review or clarification
+
+3. AUDIT REQUIREMENTS:
+   - Document decision reasoning
+   - Provide specific feedback for rejected items
+   - Suggest corrective actions
+
+Return response in JSON format:
+{
+  "overall_status": "Approved|Rejected|Hold|Review_Required",
+  "decision_summary": "clear business explanation",
+  "critical_issues_count": number,
+  "approval_conditions": ["condition1", "condition2"],
+  "checker_remarks": ["business remark 1", "business remark 2"],
+  "recommended_actions": ["action1", "action2"],
+  "business_risk_level": "Low|Medium|High|Critical",
+  "processing_authorization": "Authorized|Not_Authorized|Conditional"
+}
+""")
+
+# User stories with PACS.008 context
+USER_STORY_PROMPT = Template("""
+        Analyze this PACS.008 banking document and extract or infer User Stories with Acceptance Criteria.
+
+        Document Content: ${document}...
+        
+        PACS.008 Fields Identified: ${field_names}
+
+        Extract or create realistic User Stories that would lead to PACS.008 message processing tests.
+
+        Return in JSON format:
+        {
+          "results": [
+            {
+              "user_story_id": "US001",
+              "user_story": "As a [role], I want [goal] so that [benefit]",
+              "business_context": "how this relates to PACS.008 processing",
+              "acceptance_criteria": [
+                {
+                  "ac_id": "AC001",
+                  "ac_description": "specific testable requirement",
+                  "pacs008_fields": ["relevant field names"],
+                  "validation_focus": "what should be validated",
+                  "test_scenarios": ["scenario1", "scenario2"]
+                }
+              ]
+            }
+          ]
+        }
+
+        Focus on banking workflows like payment creation, validation, approval, processing.
+        """)
+
+# Test cases from maker-checker validation results
+VALIDATION_TEST_PROMPT = Template("""
+You are an expert BFSI test engineer generating test cases for PACS.008 message processing with Maker-Checker workflow.
+
+USER STORIES CONTEXT:
+${user_stories}
+
+PACS.008 FIELDS:
+${pacs_fields}
+
+MAKER VALIDATION RESULTS:
+${maker_findings}
+
+CHECKER VALIDATION RESULTS:
+${checker_decision}
+
+CUSTOM INSTRUCTIONS: ${custom_instructions}
+
+Generate comprehensive test cases covering:
+
+1. MAKER WORKFLOW TESTS:
+   - Field validation for each PACS.008 field
+   - Format validation (BIC, IBAN, currency, amount)
+   - Business rule validation
+   - Error handling scenarios
+
+2. CHECKER WORKFLOW TESTS:
+   - Review and approval processes
+   - Rejection scenarios with specific reasons
+   - Business rule verification
+   - Risk assessment validation
+
+3. END-TO-END WORKFLOW TESTS:
+   - Complete maker-checker-processing cycle
+   - Integration testing scenarios
+   - Error recovery workflows
+
+4. FIELD-SPECIFIC TESTS:
+   - Based on validation issues found by Maker/Checker
+   - Boundary testing for amounts and dates
+   - Format validation for each field type
+
+Each test case must:
+- Reference specific PACS.008 fields being tested
+- Include realistic banking data (valid BICs, IBANs, amounts)
+- Specify Maker or Checker role clearly
+- Include expected validation messages
+- Map to specific User Stories and Acceptance Criteria
+
+Generate exactly 15 comprehensive test cases in this format:
+{
+  "results": [
+    {
+      "User Story ID": "user_story_id from context",
+      "Acceptance Criteria ID": "ac_id from context",
+      "Scenario": "descriptive scenario name",
+      "Test Case ID": "TC001",
+      "Test Case Description": "specific description mentioning PACS.008 fields and roles",
+      "Precondition": "system state and user role",
+      "Steps": "detailed numbered steps with actual field names, values, and expected validations",
+      "Expected Result": "specific validation outcome and business result",
+      "Part of Regression": "Yes|No",
+      "Priority": "High|Medium|Low",
+      "Role_Focus": "Maker|Checker|End-to-End",
+      "PACS008_Fields_Tested": ["field names"],
+      "Validation_Type": "Format|Business_Rule|Workflow|Integration"
+    }
+  ]
+}
+""")
+
+# Test cases for a single user story / requirement
+STORY_TEST_PROMPT = Template("""
+You are an expert BFSI test engineer. Generate test cases from the provided requirement.
+
+User Story/Requirement: ${requirement}
+Custom Instructions: ${custom_instructions}
+
+Generate EXACTLY ${num_cases} test cases with these fields:
+1. User Story ID: ${story_id}
+2. Acceptance Criteria ID: Generate as AC001, AC002, etc.
+3. Scenario: Brief scenario name
+4. Test Case ID: Generate unique sequential IDs (TC001, TC002, etc.)
+5. Test Case Description: Clear one-line description
+6. Precondition: Prerequisites for test execution
+7. Steps: Detailed numbered steps (use \\n for line breaks)
+8. Expected Result: Clear expected outcome
+9. Part of Regression: "Yes" for critical functionality, "No" for edge cases
+10. Priority: "High" for happy path, "Medium" for validations, "Low" for edge cases
+
+Include positive scenarios, negative scenarios, and edge cases.
+Use realistic BFSI data (IBANs, amounts, dates, etc.)
+
+Output only a JSON object of the form {"results": [ ...test cases... ]}.
+""")
+
+# Test cases for several independent user stories in one request
+MULTI_STORY_TEST_PROMPT = Template("""
+You are an expert BFSI test engineer. Generate test cases for each of the following user stories.
+
+User Stories (JSON list of {"id", "content"}): ${stories}
+Custom Instructions: ${custom_instructions}
+
+For EACH story generate EXACTLY ${num_cases} test cases with these fields:
+1. User Story ID: the story's "id"
+2. Acceptance Criteria ID: Generate as AC001, AC002, etc.
+3. Scenario: Brief scenario name
+4. Test Case ID: Generate unique sequential IDs (TC001, TC002, etc.)
+5. Test Case Description: Clear one-line description
+6. Precondition: Prerequisites for test execution
+7. Steps: Detailed numbered steps (use \\n for line breaks)
+8. Expected Result: Clear expected outcome
+9. Part of Regression: "Yes" for critical functionality, "No" for edge cases
+10. Priority: "High" for happy path, "Medium" for validations, "Low" for edge cases
+
+Include positive scenarios, negative scenarios, and edge cases.
+Use realistic BFSI data (IBANs, amounts, dates, etc.)
+
+Return a JSON array of arrays, element i being the test cases for story i, in the same order
+as the input and with exactly ${story_count} elements.
+Output only a JSON object of the form {"results": [[ ...story 1 test cases... ], [ ...story 2... ]]}.
+""")
@@ -0,0 +1,144 @@
+# src/ai_engine/response_cache.py
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "test_gen"
+# Entries kept in memory per cache; the least recently used are dropped first (disk keeps them)
+DEFAULT_MAX_MEMORY_ENTRIES = 256
+# Seconds an entry stays valid; model outputs are sampled, so a rerun eventually gets a fresh set
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+class ResponseCache:
+    """Content-hashed cache of parsed model responses, in memory and on disk.
+
+    Each entry is a <key>.json file under cache_dir, so separate processes (e.g. CI reruns)
+    share hits. Keys should include the model name so a model change invalidates them.
+    At most max_entries values are held in memory, evicting the least recently used.
+    Entries expire ttl seconds after they were written (None keeps them forever); on disk the
+    write time is the file's mtime, and expired files are deleted.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+                 max_entries: int = DEFAULT_MAX_MEMORY_ENTRIES,
+                 ttl: Optional[float] = DEFAULT_TTL_SECONDS):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        # key -> (write time, value)
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # Guards _memory and disk writes; entry files are replaced atomically, so reads need no lock
+        self._lock = threading.Lock()
+        self._pruned = False
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """BLAKE2b digest of the JSON-serialised key parts"""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _expired(self, written_at: float) -> bool:
+        """Whether an entry written at written_at is past the TTL"""
+        return self.ttl is not None and time.time() - written_at > self.ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for key, or None on a miss"""
+        # Copies, so callers that mutate a result cannot corrupt the cached entry
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._expired(entry[0]):
+                    del self._memory[key]
+                    entry = None
+                else:
+                    self._memory.move_to_end(key)
+        if entry is not None:
+            return copy.deepcopy(entry[1])
+
+        if self.cache_dir is None:
+            return None
+
+        path = self.cache_dir / f"{key}.json"
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                written_at = os.fstat(f.fileno()).st_mtime
+                value = None if self._expired(written_at) else json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if value is None:
+            self._unlink(path)
+            return None
+
+        with self._lock:
+            self._remember(key, written_at, value)
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Any):
+        """Store value under key; disk write failures only cost the cross-process hit"""
+        value = copy.deepcopy(value)
+
+        with self._lock:
+            self._remember(key, time.time(), value)
+
+            if self.cache_dir is None:
+                return
+
+            if not self._pruned:
+                self._pruned = True
+                self._prune_expired()
+
+            tmp_path = None
+            try:
+                payload = json.dumps(value, ensure_ascii=False)
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                # Write atomically so a concurrent reader never sees a half-written entry
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.cache_dir / f"{key}.json")
+            except (OSError, TypeError, ValueError) as e:
+                logger.debug(f"Could not write response cache entry {key}: {e}")
+                if tmp_path is not None:
+                    self._unlink(Path(tmp_path))
+
+    def _remember(self, key: str, written_at: float, value: Any):
+        """Keep value in memory as the most recent entry, evicting beyond max_entries (hold _lock)"""
+        self._memory[key] = (written_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _prune_expired(self):
+        """Delete expired entry files, once per cache, so entries never read again do not pile up"""
+        if self.ttl is None:
+            return
+        try:
+            paths = list(self.cache_dir.glob('*.json'))
+        except OSError:
+            return
+        for path in paths:
+            try:
+                expired = self._expired(path.stat().st_mtime)
+            except OSError:
+                continue
+            if expired:
+                self._unlink(path)
+
+    @staticmethod
+    def _unlink(path: Path):
+        """Remove path, ignoring files that are already gone or cannot be removed"""
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
@@ -1,46 +1,496 @@
 # src/ai_engine/test_generator.py
+import asyncio
+import functools
+import hashlib
+import itertools
 import json
 import re
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, Iterator, List, Any, Mapping, Optional, Tuple
 import logging
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
+from ai_engine.response_cache import ResponseCache
 import time
 
+try:
+    import orjson  # optional, several times faster than json for model responses
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # optional, lets httpx multiplex concurrent requests over one HTTP/2 connection
+except ImportError:
+    h2 = None
+
 logger = logging.getLogger(__name__)
 
+# All patterns are compiled once at import instead of on every document
+_WS_RE = re.compile(r'\s+')
+_STRIP_RE = re.compile(r'[^\w\s\-\.\,\:\;\(\)\[\]\"\'\/\@\#\$\%\&\*\+\=\<\>\?]')
+_HSPACE_RE = re.compile(r'[^\S\n]+')
+# Story anchors, only at the start of a line so prose like "acts as a gateway" is not split;
+# spans run from one anchor to the next, so extraction is a single linear scan
+_ANCHOR_RE = re.compile(r'(?im)^[^\S\n]*(?:As\s+an?\b|User\s+Story\b[^\n:]*:|Given\b|Scenario\s*:)')
+# A span is a story only with this shape: "As a ... I want ..." or "Given ... When/Then ..."
+_STORY_SHAPE_RE = re.compile(r'(?is)\bAs\s+an?\s.*?\bI\s+want\b|\bGiven\s.*?\b(?:When|Then)\b')
+_HEADER_SPLIT_RE = re.compile(r'\n(?=\d+\.|[A-Z][A-Z\s]+:|\#|\*)')
+_EXACT_COUNT_RE = re.compile(r'exactly (\d+) test cases')
+MAX_USER_STORIES = 10
+
+# Completion budget per story: up to ~350 tokens per detailed test case plus the array framing, so
+# the default 8 cases keep the 3000 tokens they had before sizing; a cut-off response is retried
+# with MAX_RESPONSE_TOKENS
+TOKENS_PER_TEST_CASE = 350
+RESPONSE_OVERHEAD_TOKENS = 200
+MAX_RESPONSE_TOKENS = 4096
+
+_REGRESSION_VALUES = frozenset(("Yes", "No"))
+_PRIORITY_VALUES = frozenset(("High", "Medium", "Low"))
+_STRING_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+def _extract_json_array(text: str) -> Optional[str]:
+    """First balanced [...] span in text, or None.
+    
+    One left-to-right pass tracking depth and string/escape state, so brackets inside
+    JSON strings are ignored and there is no regex backtracking.
+    """
+    start = text.find('[')
+    if start < 0:
+        return None
+    
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+# Fixed per-story instructions, sent verbatim as the system message so every story request
+# starts with the same prefix (eligible for OpenAI prompt caching)
+_STORY_SYSTEM_PROMPT = """You are an expert BFSI (Banking, Financial Services, Insurance) test engineer. 
+Generate comprehensive test cases from the user story/requirement in the user message.
+
+IMPORTANT: You MUST respond with ONLY a valid JSON array. No explanations, no markdown, no code blocks. Just pure JSON.
+
+Generate EXACTLY the number of test cases requested, with these EXACT fields:
+1. User Story ID: the User Story ID given in the user message
+2. Acceptance Criteria ID: Generate as AC001, AC002, etc.
+3. Scenario: Brief scenario name (e.g., "Valid Payment Processing", "Invalid Amount Entry")
+4. Test Case ID: Generate unique sequential IDs (TC001, TC002, etc.)
+5. Test Case Description: Clear one-line description
+6. Precondition: Prerequisites for test execution
+7. Steps: Detailed numbered steps (use \\n for line breaks)
+8. Expected Result: Clear expected outcome
+9. Part of Regression: "Yes" for critical functionality, "No" for edge cases
+10. Priority: "High" for happy path, "Medium" for validations, "Low" for edge cases
+
+REQUIREMENTS:
+- Include positive scenarios (happy path)
+- Include negative scenarios (error conditions)
+- Include edge cases and boundary conditions
+- Use realistic BFSI data (IBANs, amounts, dates, etc.)
+- Each test case must be independent and executable
+- Steps should be detailed and unambiguous
+- Follow the custom instructions in the user message
+
+Output format (respond with ONLY this JSON, nothing else):
+[
+  {
+    "User Story ID": "<User Story ID from the user message>",
+    "Acceptance Criteria ID": "AC001",
+    "Scenario": "Valid Payment Processing",
+    "Test Case ID": "TC001",
+    "Test Case Description": "Verify successful payment processing with valid inputs",
+    "Precondition": "User is logged in and has sufficient balance",
+    "Steps": "1. Navigate to payment page\\n2. Enter amount: 1000.00\\n3. Enter beneficiary IBAN: DE89370400440532013000\\n4. Click Submit\\n5. Confirm payment",
+    "Expected Result": "Payment processed successfully, confirmation displayed",
+    "Part of Regression": "Yes",
+    "Priority": "High"
+  }
+]
+"""
+
+@functools.lru_cache(maxsize=32)
+def _requested_case_count(custom_instructions: str) -> int:
+    """Case count from an "exactly N test cases" instruction, else the default of 8"""
+    if "exactly" in custom_instructions:
+        match = _EXACT_COUNT_RE.search(custom_instructions)
+        if match:
+            return int(match.group(1))
+    return 8
+
+@functools.lru_cache(maxsize=32)
+def _story_prompt_head(custom_instructions: str, num_cases: int) -> str:
+    """Per-run part of the story user prompt, built once and reused for every story"""
+    return f"Number of test cases: EXACTLY {num_cases}\nCustom Instructions: {custom_instructions}\n\n"
+
+def _loads(text: str) -> Any:
+    """json.loads, via orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def _dumps(data: Any, indent: bool = False) -> str:
+    """json.dumps, via orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+    return json.dumps(data, indent=2 if indent else None)
+
+def _repair_json(text: str) -> str:
+    """Quote-aware single-pass fix-up of common model JSON mistakes.
+    
+    Single-quoted strings become double-quoted (apostrophes inside double-quoted strings
+    are left alone), raw newlines/tabs inside strings are escaped, and trailing commas
+    before } or ] are dropped.
+    """
+    out = []
+    quote = None  # delimiter of the string being walked, or None outside strings
+    escape = False
+    length = len(text)
+    for i, char in enumerate(text):
+        if quote is not None:
+            if escape:
+                escape = False
+                # \' is not a JSON escape; the apostrophe needs none inside "..."
+                out.append(char if char == "'" else '\\' + char)
+            elif char == '\\':
+                escape = True
+            elif char == quote:
+                quote = None
+                out.append('"')
+            elif char == '"':
+                out.append('\\"')  # only reachable inside a single-quoted string
+            else:
+                out.append(_STRING_ESCAPES.get(char, char))
+        elif char == '"' or char == "'":
+            quote = char
+            out.append('"')
+        elif char == ',':
+            j = i + 1
+            while j < length and text[j].isspace():
+                j += 1
+            if j == length or text[j] not in '}]':
+                out.append(char)
+        else:
+            out.append(char)
+    return "".join(out)
+
+class TestGenerationError(Exception):
+    """Why a generate_test_cases() call fell back to placeholder test cases"""
+    
+    def __init__(self, message: str, original: Optional[BaseException] = None):
+        super().__init__(message)
+        self.original = original
+
+class _FallbackCases(list):
+    """Placeholder test cases produced when generation failed; never cached"""
+
+class _PartialCases(list):
+    """Test cases from a response cut off before its array closed; used, but never cached"""
+
+class _StreamingArrayParser:
+    """Incremental parser for a streamed JSON array of objects.
+    
+    feed() takes response deltas and returns each top-level object of the first [...]
+    as soon as its closing brace arrives. String/escape state is tracked so braces
+    inside values are ignored.
+    """
+    
+    def __init__(self):
+        self.in_array = False
+        self.complete = False
+        self.failed = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._pending: List[str] = []
+    
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        objects = []
+        start = 0 if self._depth else None
+        for i, char in enumerate(chunk):
+            if self.complete or self.failed:
+                break
+            if not self.in_array:
+                self.in_array = char == '['
+                continue
+            if self._depth == 0:
+                if char == '{':
+                    self._depth = 1
+                    start = i
+                elif char == ']':
+                    self.complete = True
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._pending.append(chunk[start:i + 1])
+                    start = None
+                    try:
+                        objects.append(_loads("".join(self._pending)))
+                    except json.JSONDecodeError:
+                        self.failed = True
+                    self._pending = []
+        if start is not None and self._depth:
+            self._pending.append(chunk[start:])
+        return objects
+
 class TestCaseGenerator:
     """AI-powered test case generation using GPT-4o-mini"""
     
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
+    REQUIRED_FIELDS = (
+        "User Story ID", "Acceptance Criteria ID", "Scenario", "Test Case ID",
+        "Test Case Description", "Precondition", "Steps", "Expected Result",
+        "Part of Regression", "Priority"
+    )
+    
+    def __init__(self, api_key: str, max_concurrent: int = 8, cache: Optional[ResponseCache] = None,
+                 num_cases: Optional[int] = None):
+        # One keep-alive pool for every call this generator makes, HTTP/2 when h2 is installed
+        self._http_client = httpx.AsyncClient(
+            http2=h2 is not None,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=httpx.Timeout(120.0, connect=5.0)
+        )
+        self.client = AsyncOpenAI(api_key=api_key, http_client=self._http_client)
         self.model = "gpt-4.1-mini-2025-04-14"
+        self.max_concurrent = max_concurrent
+        # Fixed cases per story; None reads "exactly N test cases" from the custom instructions
+        self.num_cases = num_cases
+        self._loop = None
+        self._semaphore = None
+        self._semaphore_loop = None
+        # Final test cases per (document, instructions, model), shared across runs on disk
+        # for DEFAULT_TTL_SECONDS (a day), after which the same inputs are generated afresh
+        self._cache = cache if cache is not None else ResponseCache()
+        # Set when the last generate_test_cases() call had to return fallback cases
+        self.last_error: Optional[TestGenerationError] = None
+        
+    def generate_test_cases(self, content: str, custom_instructions: str = "",
+                            progress_callback: Optional[Callable[[int, int], None]] = None) -> List[Dict[str, Any]]:
+        """Generate comprehensive test cases from document content (blocking wrapper)"""
+        return self._run_sync(self.generate_test_cases_async(content, custom_instructions, progress_callback))
+    
+    def _run_sync(self, coro):
+        """Run a coroutine to completion on this generator's private event loop"""
+        # A long-lived loop (rather than asyncio.run per call) keeps the AsyncOpenAI
+        # connection pool usable across calls
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore bounding in-flight requests, created for the running loop"""
+        loop = asyncio.get_event_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    async def _create_chat_completion(self, **kwargs):
+        """Chat completion with bounded concurrency"""
+        async with self._get_semaphore():
+            return await self.client.chat.completions.create(**kwargs)
+    
+    async def _stream_chat_completion(self, **kwargs):
+        """Streamed chat completion, yielding (content delta, finish_reason) pairs as they arrive
+        (bounded concurrency); finish_reason is None until the last chunk, which may have no content"""
+        async with self._get_semaphore():
+            stream = await self.client.chat.completions.create(stream=True, **kwargs)
+            async for chunk in stream:
+                if chunk.choices:
+                    choice = chunk.choices[0]
+                    if choice.delta.content or choice.finish_reason:
+                        yield choice.delta.content or "", choice.finish_reason
+    
+    def close(self):
+        """Release the HTTP connection pool and the private event loop"""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self.client.close())
+            self._loop.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        # The OpenAI client closes the httpx pool it was given
+        await self.client.close()
+    
+    def generate_test_cases_batch(self, content: str, custom_instructions: str = "",
+                                  poll_interval: float = 10.0, max_poll_interval: float = 300.0) -> List[Dict[str, Any]]:
+        """Generate test cases through the OpenAI Batch API (blocking until the batch finishes).
         
-    def generate_test_cases(self, content: str, custom_instructions: str = "") -> List[Dict[str, Any]]:
-        """Generate comprehensive test cases from document content"""
+        Intended for offline runs such as nightly regeneration: batch requests cost half as
+        much and have their own rate limits, but may take up to 24h.
+        """
+        return self._run_sync(self._generate_test_cases_batch(content, custom_instructions,
+                                                              poll_interval, max_poll_interval))
+    
+    async def _generate_test_cases_batch(self, content: str, custom_instructions: str,
+                                         poll_interval: float, max_poll_interval: float) -> List[Dict[str, Any]]:
+        """Submit one batch line per story, poll with exponential backoff and parse the output"""
+        user_stories = self._user_stories_for(content)
+        representatives = self._story_representatives(user_stories)
+        unique_stories = [story for story, rep in zip(user_stories, representatives) if rep is story]
+        stories_by_id = {story["id"]: story for story in unique_stories}
+        
+        lines = [
+            _dumps({
+                "custom_id": story["id"],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._story_request(story, custom_instructions)
+            })
+            for story in unique_stories
+        ]
+        batch_file = await self.client.files.create(
+            file=("test_cases_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(lines)} story requests")
+        
+        delay = poll_interval
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error(f"Batch {batch.id} finished with status {batch.status}")
+            return self._validate_and_enhance_test_cases(
+                [case for story in user_stories for case in self._fallback_test_case_generation(story)]
+            )
+        
+        output = await self.client.files.content(batch.output_file_id)
+        test_cases_by_story = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = _loads(line)
+            story = stories_by_id.get(record.get("custom_id"))
+            if story is None:
+                continue
+            try:
+                response_text = record["response"]["body"]["choices"][0]["message"]["content"]
+            except (KeyError, IndexError, TypeError):
+                logger.error(f"Batch request {story['id']} failed: {record.get('error')}")
+                continue
+            test_cases_by_story[story["id"]] = self._parse_test_cases(response_text, story)
+        
+        # Keep story order; stories missing from the output get the basic fallback cases
+        all_test_cases = []
+        for story, representative in zip(user_stories, representatives):
+            test_cases = test_cases_by_story.get(representative["id"])
+            all_test_cases.extend(self._relabel_test_cases(test_cases, story) if test_cases else
+                                  self._fallback_test_case_generation(story))
+        
+        return self._validate_and_enhance_test_cases(all_test_cases)
+    
+    async def generate_test_cases_async(self, content: str, custom_instructions: str = "",
+                                        progress_callback: Optional[Callable[[int, int], None]] = None
+                                        ) -> List[Dict[str, Any]]:
+        """Generate comprehensive test cases from document content.
+        
+        Never returns None: on an unexpected failure the fallback cases are returned and
+        the cause is kept in self.last_error for callers that want to inspect or retry.
+        progress_callback(done, total) is called on the event loop's thread as each story's
+        request finishes, in completion order.
+        """
+        self.last_error = None
         try:
-            # Clean and prepare content
-            cleaned_content = self._clean_content(content)
+            cache_key = ResponseCache.make_key(self.model, "test_cases", content, custom_instructions, self.num_cases)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                logger.info("♻️ Reusing cached test cases")
+                return cached
+            
+            user_stories = self._user_stories_for(content)
+            
+            # Repeated stories (e.g. recurring boilerplate sections) are requested once
+            representatives = self._story_representatives(user_stories)
+            unique_stories = [story for story, rep in zip(user_stories, representatives) if rep is story]
+            
+            finished = 0
             
-            # Extract user stories and acceptance criteria
-            user_stories = self._extract_user_stories(cleaned_content)
+            async def generate_for_story(story):
+                nonlocal finished
+                try:
+                    return await self._generate_test_cases_for_story(story, custom_instructions)
+                finally:
+                    finished += 1
+                    if progress_callback is not None:
+                        try:
+                            progress_callback(finished, len(unique_stories))
+                        except Exception as e:
+                            logger.warning(f"Progress callback failed: {str(e)}")
             
-            if not user_stories:
-                # If no formal user stories found, treat entire content as requirements
-                user_stories = [{"id": "REQ001", "content": cleaned_content[:2000]}]
+            # Stories are independent - request them concurrently (bounded by the semaphore)
+            results = await asyncio.gather(
+                *(generate_for_story(story) for story in unique_stories),
+                return_exceptions=True
+            )
+            results_by_id = {story["id"]: result for story, result in zip(unique_stories, results)}
             
             all_test_cases = []
+            complete = True
             
-            for story in user_stories:
-                test_cases = self._generate_test_cases_for_story(story, custom_instructions)
+            for story, representative in zip(user_stories, representatives):
+                test_cases = results_by_id[representative["id"]]
+                if isinstance(test_cases, BaseException):
+                    logger.error(f"Test case generation error for {story['id']}: {str(test_cases)}")
+                    test_cases = self._fallback_test_case_generation(story)
+                elif representative is not story:
+                    test_cases = self._relabel_test_cases(test_cases, story)
+                complete = complete and not isinstance(test_cases, (_FallbackCases, _PartialCases))
                 all_test_cases.extend(test_cases)
             
             # Post-process and validate
             validated_test_cases = self._validate_and_enhance_test_cases(all_test_cases)
             
+            # A retry should get another chance at stories that fell back to placeholders or
+            # whose response was cut off
+            if complete:
+                self._cache.put(cache_key, validated_test_cases)
+            
             return validated_test_cases
             
         except Exception as e:
             logger.error(f"Error generating test cases: {str(e)}")
+            self.last_error = TestGenerationError(f"Test case generation failed: {str(e)}", original=e)
+            return self._validate_and_enhance_test_cases(self._fallback_test_case_generation({"id": "REQ001"}))
+    
     def _repair_json_response(self, response_text: str) -> str:
         """Attempt to repair malformed JSON response"""
         try:
@@ -54,30 +504,53 @@ class TestCaseGenerator:
             if end_idx == -1:
                 return ""
             
-            json_str = response_text[start_idx:end_idx + 1]
-            
-            # Fix common JSON issues
-            # Replace single quotes with double quotes
-            json_str = json_str.replace("'", '"')
-            
-            # Fix unescaped newlines in strings
-            json_str = re.sub(r'(?<!\\)\\n', '\\\\n', json_str)
-            
-            # Remove trailing commas
-            json_str = re.sub(r',\s*}', '}', json_str)
-            json_str = re.sub(r',\s*]', ']', json_str)
-            
-            return json_str
+            # Fix common JSON issues (quotes, raw newlines, trailing commas) in one pass
+            return _repair_json(response_text[start_idx:end_idx + 1])
             
         except Exception as e:
             logger.error(f"JSON repair failed: {str(e)}")
             return ""
     
+    def _user_stories_for(self, content: str) -> List[Dict[str, str]]:
+        """Clean content and extract its user stories, or treat it all as one requirement"""
+        # Regenerating with new instructions on the same document reuses the preprocessing
+        content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+        
+        # Clean and prepare content
+        cleaned_content = self._clean_content_cached(content_hash, content)
+        
+        # Extract user stories and acceptance criteria; this needs the line breaks, which
+        # _clean_content collapses
+        user_stories = [dict(story) for story in self._extract_user_stories_cached(content_hash, content)]
+        
+        if not user_stories:
+            # If no formal user stories found, treat entire content as requirements
+            user_stories = [{"id": "REQ001", "content": cleaned_content[:2000]}]
+        
+        return user_stories
+    
+    @staticmethod
+    def _story_representatives(user_stories: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """For each story, the first story with the same content (ignoring case and whitespace)"""
+        first_by_hash = {}
+        representatives = []
+        for story in user_stories:
+            normalized = _WS_RE.sub(' ', story['content'].lower()).strip()
+            content_hash = hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+            representatives.append(first_by_hash.setdefault(content_hash, story))
+        return representatives
+    
+    @staticmethod
+    def _relabel_test_cases(test_cases: List[Dict[str, Any]], story: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Copies of another story's test cases attributed to story (keeps the fallback marker)"""
+        return type(test_cases)(dict(case, **{"User Story ID": story['id']}) if isinstance(case, dict) else case
+                                for case in test_cases)
+    
     def _fallback_test_case_generation(self, story: Dict[str, str]) -> List[Dict[str, Any]]:
         """Generate basic test cases when AI parsing fails"""
         logger.info("Generating fallback test cases")
         
-        fallback_cases = [
+        fallback_cases = _FallbackCases([
             {
                 "User Story ID": story['id'],
                 "Acceptance Criteria ID": "AC001",
@@ -102,17 +575,30 @@ class TestCaseGenerator:
                 "Part of Regression": "No",
                 "Priority": "Medium"
             }
-        ]
+        ])
         
         return fallback_cases
     
-    def _clean_content(self, content: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _clean_content_cached(content_hash: bytes, content: str) -> str:
+        """_clean_content() memoized on the raw content's hash"""
+        return TestCaseGenerator._clean_content(content)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _extract_user_stories_cached(content_hash: bytes, content: str) -> Tuple[Mapping[str, str], ...]:
+        """_extract_user_stories() memoized on the raw content's hash; read-only, copy before use"""
+        return tuple(MappingProxyType(story) for story in TestCaseGenerator._extract_user_stories(content))
+    
+    @staticmethod
+    def _clean_content(content: str) -> str:
         """Clean and normalize content for processing"""
         # Remove excessive whitespace
-        content = re.sub(r'\s+', ' ', content)
+        content = _WS_RE.sub(' ', content)
         
         # Remove special characters that might interfere
-        content = re.sub(r'[^\w\s\-\.\,\:\;\(\)\[\]\"\'\/\@\#\$\%\&\*\+\=\<\>\?]', ' ', content)
+        content = _STRIP_RE.sub(' ', content)
         
         # Limit content length to avoid token limits
         if len(content) > 8000:
@@ -120,48 +606,78 @@ class TestCaseGenerator:
         
         return content.strip()
     
-    def _extract_user_stories(self, content: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _clean_content_lines(content: str) -> str:
+        """_clean_content() that keeps line breaks, for finding where stories and sections start"""
+        content = _STRIP_RE.sub(' ', content.replace('\r\n', '\n').replace('\r', '\n'))
+        content = _HSPACE_RE.sub(' ', content)
+        if len(content) > 8000:
+            content = content[:8000] + "..."
+        return content.strip()
+    
+    @staticmethod
+    def _extract_user_stories(content: str) -> List[Dict[str, str]]:
         """Extract user stories and acceptance criteria from content"""
-        user_stories = []
+        # Limit to prevent excessive API calls; scanning stops once the limit is reached
+        content = TestCaseGenerator._clean_content_lines(content)
+        return list(itertools.islice(TestCaseGenerator._iter_user_stories(content), MAX_USER_STORIES))
+    
+    @staticmethod
+    def _iter_user_stories(content: str) -> Iterator[Dict[str, str]]:
+        """User stories in content, found lazily - formal stories first, else sections.
         
-        # Pattern for formal user stories
-        story_patterns = [
-            r'(?:As\s+(?:a|an)\s+.+?I\s+want\s+.+?(?:so\s+that|in\s+order\s+to).+?)(?=As\s+(?:a|an)|$)',
-            r'(?:User\s+Story\s*:?\s*.+?)(?=User\s+Story|$)',
-            r'(?:Given\s+.+?When\s+.+?Then\s+.+?)(?=Given|$)',
-            r'(?:Scenario\s*:?\s*.+?)(?=Scenario|$)'
-        ]
+        The content is sliced at anchors that start a line. A slice with story shape starts a
+        new story; any other slice belongs to the story before it, or, ahead of the first story,
+        to the leading text, which is kept as requirement sections.
+        """
+        def sections(text: str) -> Iterator[Dict[str, str]]:
+            for i, section in enumerate(TestCaseGenerator._split_into_sections(text), 1):
+                section = _WS_RE.sub(' ', section).strip()
+                if len(section) > 50:
+                    yield {"id": f"REQ{i:03d}", "content": section}
         
-        story_id = 1
-        for pattern in story_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE | re.DOTALL)
-            for match in matches:
-                if len(match.strip()) > 20:  # Filter out very short matches
-                    user_stories.append({
-                        "id": f"US{story_id:03d}",
-                        "content": match.strip()
-                    })
+        anchors = [match.start() for match in _ANCHOR_RE.finditer(content)]
+        story_id = 0
+        current = None  # text of the story being collected
+        pending = None  # start of anchored text without story shape (e.g. a "User Story:" title)
+        for start, end in zip(anchors, anchors[1:] + [len(content)]):
+            if not _STORY_SHAPE_RE.search(content, start, end):
+                # Kept for the next story if one follows directly, else for the current one
+                if pending is not None and current is not None:
+                    current += content[pending:start]
+                pending = start
+                continue
+            
+            story_start = pending if pending is not None else start
+            pending = None
+            if current is None:
+                yield from sections(content[:story_start])
+            else:
+                story = _WS_RE.sub(' ', current).strip()
+                if len(story) > 20:  # Filter out very short matches
                     story_id += 1
+                    yield {"id": f"US{story_id:03d}", "content": story}
+            current = content[story_start:end]
         
-        # If no formal stories found, look for sections or paragraphs
-        if not user_stories:
-            sections = self._split_into_sections(content)
-            for i, section in enumerate(sections, 1):
-                if len(section.strip()) > 50:
-                    user_stories.append({
-                        "id": f"REQ{i:03d}",
-                        "content": section.strip()
-                    })
+        if current is None:
+            # No formal stories: look for sections or paragraphs
+            yield from sections(content)
+            return
         
-        return user_stories[:10]  # Limit to prevent excessive API calls
+        if pending is not None:
+            current += content[pending:]
+        story = _WS_RE.sub(' ', current).strip()
+        if len(story) > 20:
+            yield {"id": f"US{story_id + 1:03d}", "content": story}
     
-    def _split_into_sections(self, content: str) -> List[str]:
+    @staticmethod
+    def _split_into_sections(content: str) -> List[str]:
         """Split content into logical sections"""
         # Try different splitting strategies
         sections = []
         
         # Split by headers or numbered items
-        header_split = re.split(r'\n(?=\d+\.|[A-Z][A-Z\s]+:|\#|\*)', content)
+        header_split = _HEADER_SPLIT_RE.split(content)
         if len(header_split) > 1:
             sections = header_split
         else:
@@ -171,137 +687,102 @@ class TestCaseGenerator:
         
         return sections
     
-    def _generate_test_cases_for_story(self, story: Dict[str, str], custom_instructions: str) -> List[Dict[str, Any]]:
+    async def _generate_test_cases_for_story(self, story: Dict[str, str], custom_instructions: str) -> List[Dict[str, Any]]:
         """Generate test cases for a single user story"""
+        try:
+            request = self._story_request(story, custom_instructions)
+            while True:
+                # Parse each test case as soon as its object closes instead of after the whole response
+                parser = _StreamingArrayParser()
+                parts = []
+                test_cases = []
+                finish_reason = None
+                async for delta, reason in self._stream_chat_completion(**request):
+                    parts.append(delta)
+                    test_cases.extend(parser.feed(delta))
+                    finish_reason = reason or finish_reason
+                
+                # Out of tokens before the array closed: retry once with the full budget
+                truncated = finish_reason == "length" or (parser.in_array and not parser.complete)
+                if truncated and not parser.failed and request["max_tokens"] < MAX_RESPONSE_TOKENS:
+                    logger.warning(f"Response for {story['id']} was cut off at {request['max_tokens']} "
+                                   f"tokens, retrying with {MAX_RESPONSE_TOKENS}")
+                    request = dict(request, max_tokens=MAX_RESPONSE_TOKENS)
+                    continue
+                break
+            
+            if test_cases and not parser.failed:
+                logger.info(f"Streamed {len(test_cases)} test cases for {story['id']}")
+                if truncated:
+                    logger.warning(f"Response for {story['id']} is still incomplete; not caching it")
+                    return _PartialCases(test_cases)
+                return test_cases
+            
+            # Malformed stream: fall back to whole-response extraction and repair
+            return self._parse_test_cases("".join(parts), story)
+            
+        except Exception as e:
+            logger.error(f"API call error: {str(e)}")
+            return self._fallback_test_case_generation(story)
+    
+    def _story_request(self, story: Dict[str, str], custom_instructions: str) -> Dict[str, Any]:
+        """Chat completion parameters for generating one story's test cases"""
         
-    def _generate_test_cases_for_story(self, story: Dict[str, str], custom_instructions: str) -> List[Dict[str, Any]]:
-        """Generate test cases for a single user story"""
+        num_cases = self.num_cases or _requested_case_count(custom_instructions)
         
-        # Extract the exact number from instructions
-        num_cases = 8  # default
-        if "exactly" in custom_instructions:
-            import re
-            match = re.search(r'exactly (\d+) test cases', custom_instructions)
-            if match:
-                num_cases = int(match.group(1))
-        
-        prompt = f"""
-You are an expert BFSI (Banking, Financial Services, Insurance) test engineer. 
-Generate comprehensive test cases from the provided user story/requirement.
-
-User Story/Requirement:
-{story['content']}
-
-Custom Instructions: {custom_instructions}
-
-IMPORTANT: You must respond with ONLY a valid JSON array. No explanations, no markdown, no code blocks.
-
-Generate EXACTLY {num_cases} test cases with these EXACT fields:
-1. User Story ID: {story['id']}
-2. Acceptance Criteria ID: Generate as AC001, AC002, etc.
-3. Scenario: Brief scenario name (e.g., "Valid Payment Processing", "Invalid Amount Entry")
-4. Test Case ID: Generate unique sequential IDs (TC001, TC002, etc.)
-5. Test Case Description: Clear one-line description
-6. Precondition: Prerequisites for test execution
-7. Steps: Detailed numbered steps (use \\n for line breaks)
-8. Expected Result: Clear expected outcome
-9. Part of Regression: "Yes" for critical functionality, "No" for edge cases
-10. Priority: "High" for happy path, "Medium" for validations, "Low" for edge cases
-
-REQUIREMENTS:
-- Include positive scenarios (happy path)
-- Include negative scenarios (error conditions)
-- Include edge cases and boundary conditions
-- Use realistic BFSI data (IBANs, amounts, dates, etc.)
-- Each test case must be independent and executable
-- Steps should be detailed and unambiguous
-
-Output format (respond with ONLY this JSON, nothing else):
-[
-  {{
-    "User Story ID": "{story['id']}",
-    "Acceptance Criteria ID": "AC001",
-    "Scenario": "Valid Payment Processing",
-    "Test Case ID": "TC001",
-    "Test Case Description": "Verify successful payment processing with valid inputs",
-    "Precondition": "User is logged in and has sufficient balance",
-    "Steps": "1. Navigate to payment page\\n2. Enter amount: 1000.00\\n3. Enter beneficiary IBAN: DE89370400440532013000\\n4. Click Submit\\n5. Confirm payment",
-    "Expected Result": "Payment processed successfully, confirmation displayed",
-    "Part of Regression": "Yes",
-    "Priority": "High"
-  }}
-]
-"""
+        # Everything fixed lives in the system prompt so repeated calls share a cacheable prefix;
+        # the per-run head is built once, leaving only the story itself to splice in
+        prompt = (_story_prompt_head(custom_instructions, num_cases)
+                  + "User Story ID: " + story['id'] + "\nUser Story/Requirement:\n" + story['content'] + "\n")
         
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": _STORY_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.1,  # Lower temperature for more consistent JSON output
+            "max_tokens": min(MAX_RESPONSE_TOKENS, RESPONSE_OVERHEAD_TOKENS + TOKENS_PER_TEST_CASE * num_cases)
+        }
+    
+    def _parse_test_cases(self, response_text: str, story: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Extract the test case list from a model response, falling back to basic cases"""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert BFSI test engineer. You MUST respond with ONLY valid JSON array format. No explanations, no markdown, no code blocks. Just pure JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,  # Lower temperature for more consistent JSON output
-                max_tokens=3000   # Increased for more comprehensive test cases
-            )
-            
-            response_text = response.choices[0].message.content.strip()
+            response_text = response_text.strip()
             
             # Log the response for debugging
             logger.info(f"AI Response length: {len(response_text)}")
             logger.info(f"AI Response preview: {response_text[:200]}...")
             
-            # Try multiple JSON extraction methods
             test_cases = []
             
-            # Method 1: Look for JSON array
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
+            # Single forward scan for the first balanced [...] span
+            payload = _extract_json_array(response_text)
+            if payload is not None:
                 try:
-                    test_cases = json.loads(json_match.group())
-                    logger.info(f"Successfully parsed {len(test_cases)} test cases using Method 1")
+                    test_cases = _loads(payload)
+                    logger.info(f"Successfully parsed {len(test_cases)} test cases")
                 except json.JSONDecodeError as e:
-                    logger.warning(f"Method 1 JSON decode failed: {str(e)}")
-            
-            # Method 2: Look for JSON between code blocks
-            if not test_cases:
-                code_block_match = re.search(r'```(?:json)?\s*(\[.*?\])\s*```', response_text, re.DOTALL)
-                if code_block_match:
-                    try:
-                        test_cases = json.loads(code_block_match.group(1))
-                        logger.info(f"Successfully parsed {len(test_cases)} test cases using Method 2")
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Method 2 JSON decode failed: {str(e)}")
+                    logger.warning(f"JSON decode failed: {str(e)}")
             
-            # Method 3: Extract individual JSON objects
+            # If that fails, try to repair the JSON
             if not test_cases:
-                object_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-                json_objects = re.findall(object_pattern, response_text, re.DOTALL)
-                for obj_str in json_objects:
-                    try:
-                        obj = json.loads(obj_str)
-                        if 'Test Case ID' in obj or 'Test Case Description' in obj:
-                            test_cases.append(obj)
-                    except json.JSONDecodeError:
-                        continue
-                
-                if test_cases:
-                    logger.info(f"Successfully parsed {len(test_cases)} test cases using Method 3")
-            
-            # Method 4: If still no success, try to repair the JSON
-            if not test_cases:
-                logger.warning("All JSON extraction methods failed. Attempting to repair JSON...")
+                logger.warning("JSON extraction failed. Attempting to repair JSON...")
                 repaired_json = self._repair_json_response(response_text)
                 if repaired_json:
                     try:
-                        test_cases = json.loads(repaired_json)
+                        test_cases = _loads(repaired_json)
                         logger.info(f"Successfully parsed {len(test_cases)} test cases using JSON repair")
                     except json.JSONDecodeError as e:
                         logger.error(f"JSON repair also failed: {str(e)}")
             
+            if not isinstance(test_cases, list):
+                test_cases = []
+            
             if test_cases:
                 return test_cases
             else:
-                logger.error("All JSON extraction methods failed")
+                logger.error("JSON extraction failed")
                 logger.error(f"Full response: {response_text}")
                 # Return fallback test cases instead of empty list
                 return self._fallback_test_case_generation(story)
@@ -310,55 +791,39 @@ Output format (respond with ONLY this JSON, nothing else):
             logger.error(f"JSON decode error: {str(e)}")
             return self._fallback_test_case_generation(story)
         except Exception as e:
-            logger.error(f"API call error: {str(e)}")
+            logger.error(f"Response parsing error: {str(e)}")
             return self._fallback_test_case_generation(story)
     
     def _validate_and_enhance_test_cases(self, test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Validate and enhance generated test cases"""
         validated_cases = []
-        required_fields = [
-            "User Story ID", "Acceptance Criteria ID", "Scenario", "Test Case ID",
-            "Test Case Description", "Precondition", "Steps", "Expected Result",
-            "Part of Regression", "Priority"
-        ]
-        
         tc_counter = 1
-        ac_counter = 1
+        required_fields = self.REQUIRED_FIELDS
         
         for case in test_cases:
             try:
-                # Ensure all required fields exist
-                validated_case = {}
-                for field in required_fields:
-                    validated_case[field] = case.get(field, "").strip()
+                validated_case = {field: case.get(field, "").strip() for field in required_fields}
+                
+                # Validate critical fields
+                if len(validated_case["Test Case Description"]) < 10 or len(validated_case["Steps"]) < 10:
+                    continue  # Skip incomplete test cases
                 
-                # Auto-generate missing IDs
+                # Auto-generate missing IDs; acceptance criteria advance every third accepted case
                 if not validated_case["Test Case ID"]:
                     validated_case["Test Case ID"] = f"TC{tc_counter:03d}"
                 
                 if not validated_case["Acceptance Criteria ID"]:
-                    validated_case["Acceptance Criteria ID"] = f"AC{ac_counter:03d}"
-                
-                # Validate critical fields
-                if len(validated_case["Test Case Description"]) < 10:
-                    continue  # Skip incomplete test cases
-                
-                if len(validated_case["Steps"]) < 10:
-                    continue  # Skip test cases without proper steps
+                    validated_case["Acceptance Criteria ID"] = f"AC{1 + tc_counter // 3:03d}"
                 
                 # Ensure proper values for regression and priority
-                if validated_case["Part of Regression"] not in ["Yes", "No"]:
+                if validated_case["Part of Regression"] not in _REGRESSION_VALUES:
                     validated_case["Part of Regression"] = "No"
                 
-                if validated_case["Priority"] not in ["High", "Medium", "Low"]:
+                if validated_case["Priority"] not in _PRIORITY_VALUES:
                     validated_case["Priority"] = "Medium"
                 
                 validated_cases.append(validated_case)
                 tc_counter += 1
-                
-                # Update AC counter for unique acceptance criteria
-                if tc_counter % 3 == 0:  # Group every 3 test cases under same AC
-                    ac_counter += 1
                     
             except Exception as e:
                 logger.warning(f"Skipping invalid test case: {str(e)}")
@@ -367,6 +832,11 @@ Output format (respond with ONLY this JSON, nothing else):
         return validated_cases
     
     def enhance_with_custom_instructions(self, test_cases: List[Dict[str, Any]], instructions: str) -> List[Dict[str, Any]]:
+        """Enhance test cases based on custom instructions (blocking wrapper)"""
+        return self._run_sync(self.enhance_with_custom_instructions_async(test_cases, instructions))
+    
+    async def enhance_with_custom_instructions_async(self, test_cases: List[Dict[str, Any]],
+                                                     instructions: str) -> List[Dict[str, Any]]:
         """Enhance test cases based on custom instructions"""
         if not instructions or not test_cases:
             return test_cases
@@ -376,7 +846,7 @@ Based on these custom instructions: "{instructions}"
 Modify the following test cases accordingly.
 
 Current test cases:
-{json.dumps(test_cases[:5], indent=2)}  # Limit for token efficiency
+{_dumps(test_cases[:5], indent=True)}  # Limit for token efficiency
 
 Instructions could be:
 - "create more negative cases" -> Add more error scenarios
@@ -388,7 +858,7 @@ Return the modified test cases as JSON array.
 """
         
         try:
-            response = self.client.chat.completions.create(
+            response = await self._create_chat_completion(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a test optimization expert. Always respond with valid JSON."},
@@ -399,10 +869,10 @@ Return the modified test cases as JSON array.
             )
             
             response_text = response.choices[0].message.content.strip()
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
+            payload = _extract_json_array(response_text)
             
-            if json_match:
-                enhanced_cases = json.loads(json_match.group())
+            if payload is not None:
+                enhanced_cases = _loads(payload)
                 return enhanced_cases
             else:
                 return test_cases  # Return original if enhancement fails
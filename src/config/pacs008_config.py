@@ -2,11 +2,31 @@
 """
 PACS.008 Field Definitions and Validation Rules
 Based on ISO 20022 standard and BNY Mellon documentation
+
+All tables are built once at import and are read-only afterwards. In multi-process
+deployments, import this module in the parent before workers are forked (e.g. gunicorn
+--preload, or at module level in the multiprocessing main script) so every worker shares
+the parent's pages copy-on-write; calling gc.freeze() right before forking keeps the
+collector from touching, and therefore copying, those pages in the children.
 """
 
-from typing import Dict, List, Any
+import functools
+import json
+import re
+import sys
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Iterable, List, Any, Mapping, NamedTuple, Optional, Tuple
 from enum import Enum
 
+try:
+    import orjson  # optional, faster parse of the definitions file
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    import pandas as pd
+
 class FieldStatus(Enum):
     MANDATORY = "mandatory"
     OPTIONAL = "optional"
@@ -18,375 +38,58 @@ class ValidationSeverity(Enum):
     MEDIUM = "Medium"
     LOW = "Low"
 
-# PACS.008 Field Definitions
-PACS008_FIELD_DEFINITIONS = {
-    # Group Header Fields
-    "message_identification": {
-        "path": "GrpHdr/MsgId",
-        "name": "Message Identification",
-        "status": FieldStatus.MANDATORY,
-        "data_type": "string",
-        "max_length": 35,
-        "description": "Point-to-point reference for message identification",
-        "validation_rules": [
-            "Must be unique per sender",
-            "Maximum 35 characters",
-            "No special characters except dash and underscore"
-        ],
-        "test_scenarios": [
-            "valid_format", "max_length_boundary", "invalid_characters", "duplicate_id"
-        ]
-    },
-    
-    "creation_date_time": {
-        "path": "GrpHdr/CreDtTm", 
-        "name": "Creation Date Time",
-        "status": FieldStatus.MANDATORY,
-        "data_type": "datetime",
-        "format": "ISO_8601",
-        "description": "Date and time when message was created",
-        "validation_rules": [
-            "Must be valid ISO 8601 format",
-            "Cannot be future date beyond 1 day",
-            "Cannot be older than 30 days"
-        ],
-        "test_scenarios": [
-            "valid_datetime", "invalid_format", "future_date", "old_date"
-        ]
-    },
-    
-    "number_of_transactions": {
-        "path": "GrpHdr/NbOfTxs",
-        "name": "Number of Transactions", 
-        "status": FieldStatus.MANDATORY,
-        "data_type": "integer",
-        "min_value": 1,
-        "max_value": 9999,
-        "description": "Number of transactions in the message",
-        "validation_rules": [
-            "Must be positive integer",
-            "Fixed to 1 for CBPR+ usage",
-            "Maximum 9999 transactions"
-        ],
-        "test_scenarios": [
-            "valid_count", "zero_count", "negative_count", "exceeds_maximum"
-        ]
-    },
-    
-    "settlement_method": {
-        "path": "GrpHdr/SttlmInf/SttlmMtd",
-        "name": "Settlement Method",
-        "status": FieldStatus.MANDATORY,
-        "data_type": "code",
-        "allowed_values": ["INDA", "INGA", "CLRG", "COVE"],
-        "description": "Method of settlement between financial institutions",
-        "validation_rules": [
-            "Must be one of: INDA, INGA, CLRG, COVE",
-            "INDA: Settlement account maintained by Instructed Agent",
-            "INGA: Settlement account maintained by Instructing Agent",
-            "CLRG: Cleared through clearing system",
-            "COVE: Cover method"
-        ],
-        "test_scenarios": [
-            "valid_inda", "valid_inga", "valid_clrg", "valid_cove", "invalid_code"
-        ]
-    },
-    
-    # Agent Fields
-    "instructing_agent_bic": {
-        "path": "InstgAgt/FinInstnId/BICFI",
-        "name": "Instructing Agent BIC",
-        "status": FieldStatus.MANDATORY,
-        "data_type": "string",
-        "length": [8, 11],
-        "description": "BIC of the instructing financial institution",
-        "validation_rules": [
-            "Must be 8 or 11 characters",
-            "Format: 4 chars bank code + 2 chars country + 2 chars location + 3 optional chars",
-            "Must be valid registered BIC",
-            "Country code must be valid ISO 3166"
-        ],
-        "test_scenarios": [
-            "valid_8_char_bic", "valid_11_char_bic", "invalid_length", "invalid_format", "invalid_country"
-        ]
-    },
-    
-    "instructed_agent_bic": {
-        "path": "InstdAgt/FinInstnId/BICFI", 
-        "name": "Instructed Agent BIC",
-        "status": FieldStatus.MANDATORY,
-        "data_type": "string",
-        "length": [8, 11],
-        "description": "BIC of the instructed financial institution",
-        "validation_rules": [
-            "Must be 8 or 11 characters",
-            "Format: 4 chars bank code + 2 chars country + 2 chars location + 3 optional chars",
-            "Must be valid registered BIC",
-            "Should not be same as Instructing Agent BIC for external transfers"
-        ],
-        "test_scenarios": [
-            "valid_different_bic", "same_as_instructing", "invalid_format", "unregistered_bic"
-        ]
-    },
-    
-    "debtor_agent_bic": {
-        "path": "DbtrAgt/FinInstnId/BICFI",
-        "name": "Debtor Agent BIC", 
-        "status": FieldStatus.MANDATORY,
-        "data_type": "string",
-        "length": [8, 11],
-        "description": "BIC of the debtor's financial institution",
-        "validation_rules": [
-            "Must be 8 or 11 characters",
-            "Usually same as Instructing Agent BIC",
-            "Must be valid registered BIC"
-        ],
-        "test_scenarios": [
-            "matches_instructing_agent", "valid_different_bic", "invalid_bic_format"
-        ]
-    },
-    
-    "creditor_agent_bic": {
-        "path": "CdtrAgt/FinInstnId/BICFI",
-        "name": "Creditor Agent BIC",
-        "status": FieldStatus.MANDATORY, 
-        "data_type": "string",
-        "length": [8, 11],
-        "description": "BIC of the creditor's financial institution",
-        "validation_rules": [
-            "Must be 8 or 11 characters",
-            "Usually same as Instructed Agent BIC",
-            "Must be valid registered BIC"
-        ],
-        "test_scenarios": [
-            "matches_instructed_agent", "valid_different_bic", "invalid_bic_format"
-        ]
-    },
-    
-    # Amount Fields
-    "interbank_settlement_amount": {
-        "path": "IntrBkSttlmAmt",
-        "name": "Interbank Settlement Amount",
-        "status": FieldStatus.MANDATORY,
-        "data_type": "decimal",
-        "currency_required": True,
-        "min_value": 0.01,
-        "max_decimal_places": 2,
-        "description": "Amount to be settled between financial institutions",
-        "validation_rules": [
-            "Must be greater than 0",
-            "Maximum 2 decimal places",
-            "Currency must be valid ISO 4217 code",
-            "Amount format: up to 18 digits before decimal"
-        ],
-        "test_scenarios": [
-            "valid_amount_usd", "valid_amount_eur", "zero_amount", "negative_amount", 
-            "invalid_currency", "too_many_decimals", "exceeds_maximum"
-        ]
-    },
-    
-    "settlement_currency": {
-        "path": "IntrBkSttlmAmt/@Ccy",
-        "name": "Settlement Currency",
-        "status": FieldStatus.MANDATORY,
-        "data_type": "string",
-        "length": 3,
-        "description": "Currency code for settlement amount",
-        "validation_rules": [
-            "Must be valid ISO 4217 currency code",
-            "Exactly 3 characters",
-            "Must be uppercase"
-        ],
-        "test_scenarios": [
-            "valid_usd", "valid_eur", "valid_gbp", "invalid_code", "lowercase", "wrong_length"
-        ]
-    },
-    
-    "interbank_settlement_date": {
-        "path": "IntrBkSttlmDt",
-        "name": "Interbank Settlement Date",
-        "status": FieldStatus.MANDATORY,
-        "data_type": "date",
-        "format": "YYYY-MM-DD",
-        "description": "Date when settlement should occur",
-        "validation_rules": [
-            "Must be valid date format YYYY-MM-DD",
-            "Cannot be past date (except same day)",
-            "Should be business day",
-            "Cannot be more than 365 days in future"
-        ],
-        "test_scenarios": [
-            "today_date", "future_business_day", "past_date", "weekend_date", 
-            "invalid_format", "too_far_future"
-        ]
-    },
-    
-    # Identification Fields
-    "instruction_identification": {
-        "path": "InstrId",
-        "name": "Instruction Identification",
-        "status": FieldStatus.OPTIONAL,
-        "data_type": "string",
-        "max_length": 16,
-        "description": "Point-to-point reference for the instruction",
-        "validation_rules": [
-            "Maximum 16 characters for CBPR+ compatibility",
-            "Should be unique per instructing agent",
-            "No special characters except dash and underscore"
-        ],
-        "test_scenarios": [
-            "valid_16_chars", "exceeds_16_chars", "unique_reference", "special_characters"
-        ]
-    },
-    
-    "end_to_end_identification": {
-        "path": "EndToEndId",
-        "name": "End to End Identification", 
-        "status": FieldStatus.OPTIONAL,
-        "data_type": "string",
-        "max_length": 35,
-        "description": "End-to-end reference provided by debtor",
-        "validation_rules": [
-            "Maximum 35 characters",
-            "Must be passed unchanged through payment chain",
-            "Provided by originating party"
-        ],
-        "test_scenarios": [
-            "valid_reference", "max_length", "special_characters", "unchanged_propagation"
-        ]
-    },
-    
-    "uetr": {
-        "path": "UETR",
-        "name": "Unique End-to-end Transaction Reference",
-        "status": FieldStatus.MANDATORY,
-        "data_type": "string",
-        "format": "UUID_v4",
-        "length": 36,
-        "description": "Unique transaction reference using UUID v4 format",
-        "validation_rules": [
-            "Must be valid UUID v4 format",
-            "Exactly 36 characters including hyphens",
-            "Must be globally unique",
-            "Format: xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx"
-        ],
-        "test_scenarios": [
-            "valid_uuid_v4", "invalid_format", "wrong_length", "non_v4_uuid", "duplicate_uuid"
-        ]
-    },
-    
-    # Account Fields
-    "debtor_account": {
-        "path": "DbtrAcct/Id",
-        "name": "Debtor Account",
-        "status": FieldStatus.OPTIONAL,
-        "data_type": "string",
-        "formats": ["IBAN", "BBAN", "Other"],
-        "description": "Account identification of the debtor",
-        "validation_rules": [
-            "Can be IBAN, BBAN, or other account format",
-            "IBAN must pass check digit validation",
-            "Format depends on account scheme"
-        ],
-        "test_scenarios": [
-            "valid_iban", "valid_bban", "invalid_iban_checksum", "wrong_format"
-        ]
-    },
-    
-    "creditor_account": {
-        "path": "CdtrAcct/Id", 
-        "name": "Creditor Account",
-        "status": FieldStatus.OPTIONAL,
-        "data_type": "string",
-        "formats": ["IBAN", "BBAN", "Other"],
-        "description": "Account identification of the creditor",
-        "validation_rules": [
-            "Can be IBAN, BBAN, or other account format", 
-            "IBAN must pass check digit validation",
-            "Should not be same as debtor account for external transfers"
-        ],
-        "test_scenarios": [
-            "valid_iban", "different_from_debtor", "invalid_iban", "same_as_debtor"
-        ]
-    },
-    
-    # Charge Information
-    "charge_bearer": {
-        "path": "ChrgBr",
-        "name": "Charge Bearer",
-        "status": FieldStatus.OPTIONAL,
-        "data_type": "code",
-        "allowed_values": ["DEBT", "CRED", "SHAR", "SLEV"],
-        "description": "Specifies which party bears the charges",
-        "validation_rules": [
-            "Must be one of: DEBT, CRED, SHAR, SLEV",
-            "DEBT: Charges borne by debtor",
-            "CRED: Charges borne by creditor", 
-            "SHAR: Charges shared",
-            "SLEV: Service level charges"
-        ],
-        "test_scenarios": [
-            "debt_charges", "cred_charges", "shared_charges", "slev_charges", "invalid_code"
-        ]
-    },
+# Field definitions, business rules, test data and regional variations live in
+# data/pacs008.json and are parsed once at import; enum members are stored by value
+_DATA_DIR = Path(__file__).parent / "data"
+
+def _intern_strings(obj: Any) -> Any:
+    """Copy of a parsed JSON value with every str key and leaf interned"""
+    if isinstance(obj, str):
+        return sys.intern(obj)
+    if isinstance(obj, dict):
+        return {sys.intern(key): _intern_strings(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_intern_strings(item) for item in obj]
+    return obj
+
+def _freeze(obj: Any) -> Any:
+    """Read-only copy of a nested structure: dicts become MappingProxyType, lists and tuples
+    tuples, sets frozensets; other values (str, numbers, enums, compiled patterns) are shared"""
+    if isinstance(obj, dict):
+        return MappingProxyType({key: _freeze(value) for key, value in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(item) for item in obj)
+    if isinstance(obj, set):
+        return frozenset(obj)
+    return obj
+
+def _load_pacs008_data() -> Dict[str, Any]:
+    """Parse data/pacs008.json, via orjson when it is installed.
     
-    # Remittance Information
-    "remittance_information": {
-        "path": "RmtInf/Ustrd",
-        "name": "Remittance Information",
-        "status": FieldStatus.OPTIONAL,
-        "data_type": "string",
-        "max_length": 140,
-        "description": "Unstructured remittance information",
-        "validation_rules": [
-            "Maximum 140 characters",
-            "Free text for payment purpose",
-            "Should not contain sensitive information"
-        ],
-        "test_scenarios": [
-            "valid_reference", "max_length", "special_characters", "empty_field"
-        ]
-    }
-}
+    The parser allocates a fresh str for every occurrence; interning folds the repeated
+    rule sentences, scenario names and codes into one object each, and makes later set
+    and dict lookups on them mostly identity hits.
+    """
+    raw = (_DATA_DIR / "pacs008.json").read_bytes()
+    if orjson is not None:
+        return _intern_strings(orjson.loads(raw))
+    return _intern_strings(json.loads(raw))
+
+_FIELD_STATUS_BY_VALUE = {member.value: member for member in FieldStatus}
+_SEVERITY_BY_VALUE = {member.value: member for member in ValidationSeverity}
+
+_PACS008_DATA = _load_pacs008_data()
+
+# PACS.008 Field Definitions
+PACS008_FIELD_DEFINITIONS = _PACS008_DATA["field_definitions"]
+for _field_def in PACS008_FIELD_DEFINITIONS.values():
+    _field_def["status"] = _FIELD_STATUS_BY_VALUE[_field_def["status"]]
 
 # Validation Rules for Business Logic
-PACS008_BUSINESS_RULES = {
-    "consistency_checks": {
-        "amount_currency_consistency": {
-            "description": "Settlement amount and currency must be consistent",
-            "rule": "interbank_settlement_amount.currency == settlement_currency",
-            "severity": ValidationSeverity.CRITICAL
-        },
-        "agent_relationship": {
-            "description": "Instructing and Instructed agents should be different for external transfers",
-            "rule": "instructing_agent_bic != instructed_agent_bic",
-            "severity": ValidationSeverity.HIGH
-        },
-        "settlement_date_logic": {
-            "description": "Settlement date should not be in the past",
-            "rule": "interbank_settlement_date >= today",
-            "severity": ValidationSeverity.HIGH
-        }
-    },
-    
-    "format_validations": {
-        "bic_format": {
-            "description": "All BIC codes must follow ISO 9362 format",
-            "pattern": r"^[A-Z]{6}[A-Z0-9]{2}([A-Z0-9]{3})?$",
-            "severity": ValidationSeverity.CRITICAL
-        },
-        "currency_format": {
-            "description": "Currency codes must be valid ISO 4217",
-            "pattern": r"^[A-Z]{3}$",
-            "severity": ValidationSeverity.CRITICAL
-        },
-        "uuid_format": {
-            "description": "UETR must be valid UUID v4 format",
-            "pattern": r"^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$",
-            "severity": ValidationSeverity.CRITICAL
-        }
-    }
-}
+PACS008_BUSINESS_RULES = _PACS008_DATA["business_rules"]
+for _rule_group in PACS008_BUSINESS_RULES.values():
+    for _rule in _rule_group.values():
+        _rule["severity"] = _SEVERITY_BY_VALUE[_rule["severity"]]
 
 # Test Case Templates for Different Validation Types
 PACS008_TEST_TEMPLATES = {
@@ -425,67 +128,378 @@ PACS008_TEST_TEMPLATES = {
 }
 
 # Example realistic test data
-PACS008_TEST_DATA = {
-    "valid_bics": [
-        "DEUTDEFF", "CHASUS33", "BNPAFRPP", "HSBCGB2L", "CITIUS33",
-        "BANKAUAAXXX", "BANKGBCCXXX", "BANKUSBBXXX"
-    ],
-    "invalid_bics": [
-        "INVALID123", "SHORT", "TOOLONGBICCODE", "123INVALID", "invalid"
-    ],
-    "valid_currencies": ["USD", "EUR", "GBP", "CHF", "JPY", "CAD", "AUD"],
-    "invalid_currencies": ["US", "EURO", "POUND", "XYZ", "123"],
-    "valid_amounts": ["100.00", "1000.50", "50000.00", "999999.99"],
-    "invalid_amounts": ["0.00", "-100.00", "100.123", "abc.def"],
-    "valid_settlement_methods": ["INDA", "INGA", "CLRG", "COVE"],
-    "invalid_settlement_methods": ["INVALID", "ABC", "123", ""],
-    "valid_charge_bearer": ["DEBT", "CRED", "SHAR", "SLEV"],
-    "invalid_charge_bearer": ["INVALID", "DEB", "CREDITOR", "123"]
+PACS008_TEST_DATA = _PACS008_DATA["test_data"]
+
+# Lookup sets and compiled patterns, built once at import for O(1) membership checks.
+# Code values are interned on load and path segments below, so set lookups mostly resolve on identity.
+# Full code registries, loaded once from the data files next to this module
+def _load_code_list(filename: str) -> FrozenSet[str]:
+    """Codes from a whitespace-separated list file ('#' starts a comment)"""
+    with open(_DATA_DIR / filename, encoding="utf-8") as f:
+        return frozenset(sys.intern(code) for line in f for code in line.split("#", 1)[0].split())
+
+ISO4217_CURRENCIES = _load_code_list("iso4217.txt")
+ISO3166_ALPHA2 = _load_code_list("iso3166_alpha2.txt")
+
+VALID_BICS = frozenset(PACS008_TEST_DATA["valid_bics"])
+VALID_CURRENCIES = frozenset(PACS008_TEST_DATA["valid_currencies"])
+VALID_SETTLEMENT_METHODS = frozenset(PACS008_TEST_DATA["valid_settlement_methods"])
+VALID_CHARGE_BEARERS = frozenset(PACS008_TEST_DATA["valid_charge_bearer"])
+
+# "allowed_values" stays an ordered list for display; the set sits alongside it.
+# Paths are pre-split so validators never split("/") per message.
+for _field_def in PACS008_FIELD_DEFINITIONS.values():
+    _field_def["path_parts"] = tuple(sys.intern(part) for part in _field_def["path"].split("/"))
+    _field_def["test_scenarios"] = tuple(_field_def.get("test_scenarios", ()))
+    if "allowed_values" in _field_def:
+        _field_def["allowed_values_set"] = frozenset(_field_def["allowed_values"])
+
+# All three formats are ASCII-only, so re.ASCII skips the Unicode character tables
+for _format_rule in PACS008_BUSINESS_RULES["format_validations"].values():
+    _format_rule["regex"] = re.compile(_format_rule["pattern"], re.ASCII)
+
+BIC_RE = PACS008_BUSINESS_RULES["format_validations"]["bic_format"]["regex"]
+CURRENCY_RE = PACS008_BUSINESS_RULES["format_validations"]["currency_format"]["regex"]
+UUID_RE = PACS008_BUSINESS_RULES["format_validations"]["uuid_format"]["regex"]
+
+# bytes counterparts for callers validating raw ASCII input (e.g. straight from XML bytes)
+BIC_RE_BYTES = re.compile(BIC_RE.pattern.encode("ascii"))
+UUID_RE_BYTES = re.compile(UUID_RE.pattern.encode("ascii"))
+ISO4217_CURRENCIES_BYTES = frozenset(code.encode("ascii") for code in ISO4217_CURRENCIES)
+ISO3166_ALPHA2_BYTES = frozenset(code.encode("ascii") for code in ISO3166_ALPHA2)
+VALID_BICS_BYTES = frozenset(bic.encode("ascii") for bic in VALID_BICS)
+VALID_CURRENCIES_BYTES = frozenset(code.encode("ascii") for code in VALID_CURRENCIES)
+
+# The tables are fixed, so the field groupings and path index are computed once. Freezing
+# them all the way down keeps callers from invalidating those, and makes it safe to hand
+# the shared objects out directly: there is nothing to deepcopy before use
+PACS008_FIELD_DEFINITIONS = _freeze(PACS008_FIELD_DEFINITIONS)
+PACS008_BUSINESS_RULES = _freeze(PACS008_BUSINESS_RULES)
+PACS008_TEST_TEMPLATES = _freeze(PACS008_TEST_TEMPLATES)
+PACS008_TEST_DATA = _freeze(PACS008_TEST_DATA)
+_EMPTY_DEFINITION: Mapping[str, Any] = MappingProxyType({})
+
+_MANDATORY_FIELDS = tuple(name for name, defn in PACS008_FIELD_DEFINITIONS.items()
+                          if defn["status"] is FieldStatus.MANDATORY)
+_OPTIONAL_FIELDS = tuple(name for name, defn in PACS008_FIELD_DEFINITIONS.items()
+                         if defn["status"] is FieldStatus.OPTIONAL)
+_CONDITIONAL_FIELDS = tuple(name for name, defn in PACS008_FIELD_DEFINITIONS.items()
+                            if defn["status"] is FieldStatus.CONDITIONAL)
+_FIELD_BY_PATH = {defn["path"]: (name, defn) for name, defn in PACS008_FIELD_DEFINITIONS.items()}
+
+# Scenario names repeat across fields (invalid_format, special_characters, ...); the reverse
+# index answers "which fields exercise this scenario" and supports set algebra over fields
+_SCENARIO_FIELDS: Dict[str, List[str]] = {}
+for _name, _field_def in PACS008_FIELD_DEFINITIONS.items():
+    for _scenario in _field_def["test_scenarios"]:
+        _SCENARIO_FIELDS.setdefault(_scenario, []).append(_name)
+
+SCENARIO_TO_FIELDS = MappingProxyType({
+    scenario: frozenset(names) for scenario, names in _SCENARIO_FIELDS.items()
+})
+ALL_SCENARIOS = frozenset(SCENARIO_TO_FIELDS)
+
+class FieldDef(NamedTuple):
+    """Fixed-schema record for one field definition, for attribute access when iterating all fields"""
+    name: str
+    path: str
+    status: FieldStatus
+    data_type: str
+    max_length: Optional[int]
+    allowed_values: Optional[FrozenSet[str]]
+    regex: Optional[re.Pattern]
+    min_value: Optional[float]
+    max_value: Optional[float]
+    description: str
+    test_scenarios: Tuple[str, ...]
+
+class FieldCheck(NamedTuple):
+    """One field's validation rules, flattened so validators need no dict lookups per message"""
+    name: str
+    path_parts: Tuple[str, ...]
+    required: bool
+    max_len: Optional[int]
+    lengths: Optional[FrozenSet[int]]
+    allowed_set: Optional[FrozenSet[str]]
+    regex: Optional[re.Pattern]
+    min_value: Optional[float]
+    max_value: Optional[float]
+
+# Which format_validations pattern applies to which field
+_FORMAT_RULE_BY_FIELD = {
+    "instructing_agent_bic": "bic_format",
+    "instructed_agent_bic": "bic_format",
+    "debtor_agent_bic": "bic_format",
+    "creditor_agent_bic": "bic_format",
+    "settlement_currency": "currency_format",
+    "uetr": "uuid_format",
 }
 
+@functools.lru_cache(maxsize=None)
+def compile_pacs008_plan() -> Tuple[FieldCheck, ...]:
+    """Compile the field definitions into a flat tuple of FieldCheck entries, in definition order.
+    
+    Cached, so validators that compile the plan on construction all share one copy.
+    """
+    format_rules = PACS008_BUSINESS_RULES["format_validations"]
+    plan = []
+    for name, defn in PACS008_FIELD_DEFINITIONS.items():
+        length = defn.get("length")
+        lengths = frozenset(length if isinstance(length, list) else [length]) if length is not None else None
+        rule_name = _FORMAT_RULE_BY_FIELD.get(name)
+        plan.append(FieldCheck(
+            name=name,
+            path_parts=defn["path_parts"],
+            required=defn["status"] is FieldStatus.MANDATORY,
+            max_len=defn.get("max_length", max(lengths) if lengths else None),
+            lengths=lengths,
+            allowed_set=defn.get("allowed_values_set"),
+            regex=format_rules[rule_name]["regex"] if rule_name else None,
+            min_value=defn.get("min_value"),
+            max_value=defn.get("max_value")
+        ))
+    return tuple(plan)
+
+_COMPILED_PLAN = compile_pacs008_plan()
+
+# Records in definition order; PACS008_FIELD_DEFINITIONS stays the full (read-only) dict view
+PACS008_FIELDS: Tuple[FieldDef, ...] = tuple(
+    FieldDef(
+        name=name,
+        path=defn["path"],
+        status=defn["status"],
+        data_type=defn["data_type"],
+        max_length=check.max_len,
+        allowed_values=defn.get("allowed_values_set"),
+        regex=check.regex,
+        min_value=defn.get("min_value"),
+        max_value=defn.get("max_value"),
+        description=defn["description"],
+        test_scenarios=defn["test_scenarios"]
+    )
+    for (name, defn), check in zip(PACS008_FIELD_DEFINITIONS.items(), _COMPILED_PLAN)
+)
+_FIELDS_BY_NAME = {field.name: field for field in PACS008_FIELDS}
+
 # Helper functions for field validation
-def get_field_definition(field_name: str) -> Dict[str, Any]:
-    """Get field definition by name"""
-    return PACS008_FIELD_DEFINITIONS.get(field_name, {})
+def get_field_definition(field_name: str) -> Mapping[str, Any]:
+    """Get field definition by name (read-only; empty for unknown fields)"""
+    return PACS008_FIELD_DEFINITIONS.get(field_name, _EMPTY_DEFINITION)
+
+def get_field(field_name: str) -> Optional[FieldDef]:
+    """Get the FieldDef record by name"""
+    return _FIELDS_BY_NAME.get(field_name)
 
-def get_mandatory_fields() -> List[str]:
-    """Get list of mandatory field names"""
-    return [name for name, defn in PACS008_FIELD_DEFINITIONS.items() 
-            if defn.get("status") == FieldStatus.MANDATORY]
+def get_field_by_path(path: str) -> Optional[Tuple[str, Mapping[str, Any]]]:
+    """Get (field name, field definition) for an XML path such as GrpHdr/MsgId"""
+    return _FIELD_BY_PATH.get(path)
 
-def get_optional_fields() -> List[str]:
-    """Get list of optional field names"""
-    return [name for name, defn in PACS008_FIELD_DEFINITIONS.items() 
-            if defn.get("status") == FieldStatus.OPTIONAL]
+def get_compiled_plan() -> Tuple[FieldCheck, ...]:
+    """Get the precompiled validation plan (see compile_pacs008_plan)"""
+    return _COMPILED_PLAN
 
-def get_test_scenarios_for_field(field_name: str) -> List[str]:
+def validate_batch(df: "pd.DataFrame") -> "pd.DataFrame":
+    """Validate many messages at once, column by column.
+    
+    df has one row per message and one column per field name (e.g. "settlement_method").
+    Returns a boolean DataFrame with one column per field in the compiled plan (True = passes)
+    plus "__valid", True for rows where every field passes. A missing optional field passes,
+    a missing mandatory field fails.
+    """
+    import pandas as pd  # only batch callers pay for the pandas import
+    
+    results = {}
+    for check in _COMPILED_PLAN:
+        if check.name not in df.columns:
+            results[check.name] = pd.Series(not check.required, index=df.index)
+            continue
+        
+        values = df[check.name].fillna("").astype(str)
+        lengths = values.str.len()
+        present = lengths > 0
+        mask = pd.Series(True, index=df.index)
+        
+        if check.allowed_set is not None:
+            mask &= values.isin(check.allowed_set)
+        if check.regex is not None:
+            mask &= values.str.fullmatch(check.regex)
+        if check.regex is BIC_RE:
+            mask &= values.str[4:6].isin(ISO3166_ALPHA2)
+        elif check.regex is CURRENCY_RE:
+            mask &= values.isin(ISO4217_CURRENCIES)
+        if check.lengths is not None:
+            mask &= lengths.isin(check.lengths)
+        if check.max_len is not None:
+            mask &= lengths <= check.max_len
+        if check.min_value is not None or check.max_value is not None:
+            numbers = pd.to_numeric(values, errors="coerce")
+            if check.min_value is not None:
+                mask &= numbers >= check.min_value
+            if check.max_value is not None:
+                mask &= numbers <= check.max_value
+        
+        results[check.name] = (mask & present) if check.required else (mask | ~present)
+    
+    report = pd.DataFrame(results, index=df.index)
+    report["__valid"] = report.all(axis=1)
+    return report
+
+def _field_validator_source(index: int, check: FieldCheck) -> str:
+    """Source for validate_<field>(value) with the check's limits inlined as literals.
+    
+    Same semantics as one cell of validate_batch(): "" is a missing value.
+    """
+    conditions = []
+    if check.lengths is not None:
+        conditions.append(f"len(value) in {tuple(sorted(check.lengths))!r}")
+    if check.max_len is not None and (check.lengths is None or check.max_len < max(check.lengths)):
+        conditions.append(f"len(value) <= {check.max_len!r}")
+    if check.allowed_set is not None:
+        conditions.append(f"value in _allowed_{index}")
+    if check.regex is not None:
+        conditions.append(f"_fullmatch_{index}(value) is not None")
+    if check.regex is BIC_RE:
+        conditions.append("value[4:6] in _countries")
+    elif check.regex is CURRENCY_RE:
+        conditions.append("value in _currencies")
+    
+    lines = [
+        f"def validate_{check.name}(value):",
+        "    if not value:",
+        f"        return {not check.required!r}"
+    ]
+    if check.min_value is not None or check.max_value is not None:
+        lines += [
+            "    try:",
+            "        number = float(value)",
+            "    except ValueError:",
+            "        return False"
+        ]
+        if check.min_value is not None:
+            conditions.append(f"number >= {check.min_value!r}")
+        if check.max_value is not None:
+            conditions.append(f"number <= {check.max_value!r}")
+    lines.append(f"    return {' and '.join(conditions) or 'True'}")
+    return "\n".join(lines)
+
+def _build_field_validators(plan: Tuple[FieldCheck, ...]) -> Dict[str, Callable[[str], bool]]:
+    """Compile one specialised function per field, so single-message validation does no
+    definition lookups, enum comparisons or attribute access per value"""
+    namespace: Dict[str, Any] = {"_countries": ISO3166_ALPHA2, "_currencies": ISO4217_CURRENCIES}
+    sources = []
+    for index, check in enumerate(plan):
+        if check.allowed_set is not None:
+            namespace[f"_allowed_{index}"] = check.allowed_set
+        if check.regex is not None:
+            namespace[f"_fullmatch_{index}"] = check.regex.fullmatch
+        sources.append(_field_validator_source(index, check))
+    exec(compile("\n\n".join(sources), "<pacs008 field validators>", "exec"), namespace)
+    return {check.name: namespace[f"validate_{check.name}"] for check in plan}
+
+FIELD_VALIDATORS: Mapping[str, Callable[[str], bool]] = MappingProxyType(_build_field_validators(_COMPILED_PLAN))
+
+def get_field_validator(field_name: str) -> Optional[Callable[[str], bool]]:
+    """Get the compiled validator for a field (value: str -> passes)"""
+    return FIELD_VALIDATORS.get(field_name)
+
+def validate_message(message: Mapping[str, str]) -> List[str]:
+    """Names of the fields that fail for one message (field name -> value); empty when it is valid.
+    
+    Absent and empty fields count as missing, as in validate_batch().
+    """
+    return [name for name, validate in FIELD_VALIDATORS.items() if not validate(message.get(name) or "")]
+
+def get_mandatory_fields() -> Tuple[str, ...]:
+    """Get mandatory field names"""
+    return _MANDATORY_FIELDS
+
+def get_optional_fields() -> Tuple[str, ...]:
+    """Get optional field names"""
+    return _OPTIONAL_FIELDS
+
+def get_conditional_fields() -> Tuple[str, ...]:
+    """Get conditional field names"""
+    return _CONDITIONAL_FIELDS
+
+def is_valid_bic(value: str) -> bool:
+    """Check a BIC's ISO 9362 syntax and that positions 5-6 are an ISO 3166 country code"""
+    return BIC_RE.fullmatch(value) is not None and value[4:6] in ISO3166_ALPHA2
+
+def is_valid_currency(value: str) -> bool:
+    """Check that value is an ISO 4217 currency code"""
+    return value in ISO4217_CURRENCIES
+
+def is_valid_bic_bytes(value: bytes) -> bool:
+    """is_valid_bic() for ASCII bytes"""
+    return BIC_RE_BYTES.fullmatch(value) is not None and value[4:6] in ISO3166_ALPHA2_BYTES
+
+def is_valid_currency_bytes(value: bytes) -> bool:
+    """is_valid_currency() for ASCII bytes"""
+    return value in ISO4217_CURRENCIES_BYTES
+
+def is_valid_uetr_bytes(value: bytes) -> bool:
+    """UETR (lowercase UUID v4) format check for ASCII bytes"""
+    return UUID_RE_BYTES.fullmatch(value) is not None
+
+# Bulk forms for validating many values outside a DataFrame; the pattern and registry
+# lookups are bound once per call rather than resolved per value
+def validate_bics(values: Iterable[str]) -> List[bool]:
+    """is_valid_bic() for each value"""
+    fullmatch, countries = BIC_RE.fullmatch, ISO3166_ALPHA2
+    return [fullmatch(value) is not None and value[4:6] in countries for value in values]
+
+def validate_currencies(values: Iterable[str]) -> List[bool]:
+    """is_valid_currency() for each value"""
+    currencies = ISO4217_CURRENCIES
+    return [value in currencies for value in values]
+
+def validate_uetrs(values: Iterable[str]) -> List[bool]:
+    """UETR (lowercase UUID v4) format check for each value"""
+    fullmatch = UUID_RE.fullmatch
+    return [fullmatch(value) is not None for value in values]
+
+def is_allowed(field_name: str, value: str) -> bool:
+    """Check a value against a code field's allowed values (fields without a code list accept any value)"""
+    allowed = PACS008_FIELD_DEFINITIONS.get(field_name, {}).get("allowed_values_set")
+    return allowed is None or value in allowed
+
+def get_test_scenarios_for_field(field_name: str) -> Tuple[str, ...]:
     """Get test scenarios for a specific field"""
     field_def = get_field_definition(field_name)
-    return field_def.get("test_scenarios", [])
+    return field_def.get("test_scenarios", ())
+
+def get_fields_for_scenario(scenario: str) -> FrozenSet[str]:
+    """Get the names of the fields that list a test scenario"""
+    return SCENARIO_TO_FIELDS.get(scenario, frozenset())
 
-def get_validation_rules_for_field(field_name: str) -> List[str]:
+def get_validation_rules_for_field(field_name: str) -> Tuple[str, ...]:
     """Get validation rules for a specific field"""
     field_def = get_field_definition(field_name)
-    return field_def.get("validation_rules", [])
+    return field_def.get("validation_rules", ())
 
 # Configuration for different banking regions
-REGIONAL_VARIATIONS = {
-    "CBPR_PLUS": {
-        "instruction_id_max_length": 16,
-        "settlement_methods": ["INDA", "INGA"],
-        "mandatory_fields": ["uetr", "instructing_agent_bic", "instructed_agent_bic"]
-    },
-    "SEPA": {
-        "charge_bearer_allowed": ["SHAR"],
-        "currency_restriction": ["EUR"],
-        "account_format": ["IBAN"]
-    },
-    "RTGS": {
-        "settlement_methods": ["CLRG"],
-        "real_time_processing": True,
-        "high_value_threshold": 100000.00
-    }
-}
+REGIONAL_VARIATIONS = _PACS008_DATA["regional_variations"]
+
+# Whitelists become frozensets and the table read-only,
+# so region constraints can be combined with set algebra
+REGIONAL_VARIATIONS = MappingProxyType({
+    region: MappingProxyType({
+        key: frozenset(value) if isinstance(value, list) else value
+        for key, value in variation.items()
+    })
+    for region, variation in REGIONAL_VARIATIONS.items()
+})
+
+@functools.lru_cache(maxsize=None)
+def get_regional_allowed_values(key: str, *regions: str) -> Optional[FrozenSet[str]]:
+    """Values allowed for key in every given region, e.g. ("settlement_methods", "CBPR_PLUS", "RTGS").
+    
+    Regions that do not restrict key are ignored; None means no region restricts it.
+    """
+    restrictions = [REGIONAL_VARIATIONS[region][key] for region in regions if key in REGIONAL_VARIATIONS[region]]
+    if not restrictions:
+        return None
+    return frozenset.intersection(*restrictions)
 
 if __name__ == "__main__":
     # Example usage
@@ -0,0 +1,22 @@
+# src/config/runtime_state.py
+"""
+Process-wide runtime state shared between main.py and the Streamlit app.
+
+main.py fills this in after validating the system, and the UI reads it
+directly, so nothing has to be serialized through environment variables.
+"""
+
+from typing import Dict
+
+# Enhanced feature availability detected at startup
+ENHANCED_FEATURES: Dict[str, bool] = {}
+
+def set_enhanced_features(features) -> None:
+    """Record the enhanced feature flags detected at startup"""
+    ENHANCED_FEATURES.clear()
+    ENHANCED_FEATURES.update(features)
+
+def is_pacs008_enabled() -> bool:
+    """True when both PACS.008 config and the enhanced generator are available"""
+    return bool(ENHANCED_FEATURES.get('pacs008_config') and
+                ENHANCED_FEATURES.get('enhanced_test_generator'))
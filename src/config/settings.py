@@ -1,13 +1,21 @@
 # config/settings.py
+import functools
+import json
 import os
-from dataclasses import dataclass
-from typing import List, Dict
+from dataclasses import asdict, dataclass, fields
+from typing import Tuple
 
-@dataclass
+try:
+    import orjson  # optional, faster settings (de)serialization
+except ImportError:
+    orjson = None
+
+# Frozen so a Settings instance is immutable and hashable. Not slots=True, which needs Python 3.10+.
+@dataclass(frozen=True)
 class Settings:
-    # API Configuration
-    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
-    ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY", "")
+    # API Configuration (read from the environment by from_env())
+    OPENAI_API_KEY: str = ""
+    ANTHROPIC_API_KEY: str = ""
     
     # Model preferences
     PRIMARY_MODEL: str = "gpt-4.1-mini-2025-04-14"
@@ -15,13 +23,13 @@ class Settings:
     
     # File processing
     MAX_FILE_SIZE_MB: int = 50
-    SUPPORTED_FORMATS: List[str] = [
+    SUPPORTED_FORMATS: Tuple[str, ...] = (
         '.docx', '.pdf', '.xlsx', '.png', '.jpg', '.jpeg', 
         '.txt', '.eml', '.json', '.xml', '.csv'
-    ]
+    )
     
     # Output configuration
-    OUTPUT_FIELDS: List[str] = [
+    OUTPUT_FIELDS: Tuple[str, ...] = (
         "User Story ID",
         "Acceptance Criteria ID", 
         "Scenario",
@@ -32,10 +40,10 @@ class Settings:
         "Expected Result",
         "Part of Regression",
         "Priority"
-    ]
+    )
     
     # OCR settings
-    OCR_LANGUAGES: List[str] = ['eng']
+    OCR_LANGUAGES: Tuple[str, ...] = ('eng',)
     OCR_CONFIG: str = '--oem 3 --psm 6'
     
     # AI generation settings
@@ -46,6 +54,35 @@ class Settings:
     # Security
     TEMP_FILE_CLEANUP: bool = True
     LOG_SENSITIVE_DATA: bool = False
+    
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Settings with API keys read from the environment at call time (e.g. after load_dotenv)"""
+        return cls(
+            OPENAI_API_KEY=os.getenv("OPENAI_API_KEY", ""),
+            ANTHROPIC_API_KEY=os.getenv("ANTHROPIC_API_KEY", "")
+        )
+    
+    def to_bytes(self) -> bytes:
+        """JSON encoding, for handing settings to worker processes without re-reading the env"""
+        if orjson is not None:
+            return orjson.dumps(asdict(self))
+        return json.dumps(asdict(self)).encode("utf-8")
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Settings":
+        """Inverse of to_bytes(); JSON arrays come back as tuples and unknown keys are ignored"""
+        raw = orjson.loads(data) if orjson is not None else json.loads(data)
+        known = {f.name for f in fields(cls)}
+        return cls(**{
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in raw.items() if key in known
+        })
+
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Shared process-wide Settings, read from the environment on first use"""
+    return Settings.from_env()
 
 # Prompts for test case generation
 TEST_CASE_GENERATION_PROMPT = """
@@ -1,16 +1,87 @@
 # src/exporters/excel_exporter.py
-import pandas as pd
 import json
 import csv
+import os
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import CellIsRule
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
 
+try:
+    import orjson  # optional, much faster JSON export (same output as json.dump)
+except ImportError:
+    orjson = None
+
+try:
+    import xlsxwriter  # optional, streams the Excel export in a single pass, much faster than openpyxl
+except ImportError:
+    xlsxwriter = None
+
+try:
+    import zstandard  # optional, compressed JSON cache of exported test cases
+except ImportError:
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
+# zstd level for the .json.zst cache: zstd's default, several times smaller than the JSON at
+# hundreds of MB/s; decompression speed does not depend on it
+ZSTD_LEVEL = 3
+
+# openpyxl styles are immutable value objects, so one instance of each is shared by every cell
+# (colors are full ARGB; 6-digit values get a transparent 00 alpha)
+HEADER_FONT = Font(bold=True, color="FFFFFFFF")
+HEADER_FILL = PatternFill(start_color="FF366092", end_color="FF366092", fill_type="solid")
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
+WRAP_ALIGNMENT = Alignment(wrap_text=True, vertical="top")
+_THIN_SIDE = Side(style='thin')
+THIN_BORDER = Border(left=_THIN_SIDE, right=_THIN_SIDE, top=_THIN_SIDE, bottom=_THIN_SIDE)
+PRIORITY_FILLS = {
+    "High": PatternFill(start_color="FFFFE6E6", end_color="FFFFE6E6", fill_type="solid"),
+    "Medium": PatternFill(start_color="FFFFF2CC", end_color="FFFFF2CC", fill_type="solid"),
+    "Low": PatternFill(start_color="FFE6F3E6", end_color="FFE6F3E6", fill_type="solid")
+}
+SUMMARY_HEADING_FONT = Font(bold=True, size=12)
+
+# Priority colors are not cell styles: one conditional-format rule per priority covers the
+# whole Priority column (and follows later edits of the value).
+# Each cell format is registered once per workbook as a named style. Assigning a named style sets
+# the whole format in one step, where setting font/fill/border/alignment separately re-hashes
+# each style object against the workbook's style tables for every cell.
+HEADER_STYLE = "Test Case Header"
+CELL_STYLE = "Test Case Cell"
+STEPS_STYLE = "Test Case Steps"
+SUMMARY_HEADING_STYLE = "Summary Heading"
+
+# The same formats for the xlsxwriter engine
+XLSXWRITER_HEADER_FORMAT = {"bold": True, "font_color": "#FFFFFF", "bg_color": "#366092",
+                            "align": "center", "valign": "vcenter", "border": 1}
+XLSXWRITER_CELL_FORMAT = {"border": 1}
+XLSXWRITER_STEPS_FORMAT = {"border": 1, "text_wrap": True, "valign": "top"}
+XLSXWRITER_PRIORITY_COLORS = {"High": "#FFE6E6", "Medium": "#FFF2CC", "Low": "#E6F3E6"}
+XLSXWRITER_SUMMARY_HEADING_FORMAT = {"bold": True, "font_size": 12}
+
+COLUMN_WIDTHS = {
+    'A': 15,  # User Story ID
+    'B': 20,  # Acceptance Criteria ID
+    'C': 25,  # Scenario
+    'D': 15,  # Test Case ID
+    'E': 40,  # Test Case Description
+    'F': 30,  # Precondition
+    'G': 50,  # Steps
+    'H': 40,  # Expected Result
+    'I': 18,  # Part of Regression
+    'J': 12   # Priority
+}
+SUMMARY_COLUMN_WIDTHS = {'A': 25, 'B': 15}
+
 class TestCaseExporter:
     """Export test cases to Excel, CSV, and JSON formats"""
     
@@ -28,77 +99,23 @@ class TestCaseExporter:
             "Priority"
         ]
     
-    def export_to_excel(self, test_cases: List[Dict[str, Any]], output_path: str) -> str:
-        """Export test cases to formatted Excel file"""
+    def export_to_excel(self, test_cases: List[Dict[str, Any]], output_path: str,
+                        engine: Optional[str] = None) -> str:
+        """Export test cases to formatted Excel file.
+        
+        engine is "xlsxwriter" or "openpyxl"; by default xlsxwriter is used when it is installed.
+        Both produce the same sheets and formatting.
+        """
+        if engine is None:
+            engine = "xlsxwriter" if xlsxwriter is not None else "openpyxl"
+        
         try:
-            # Create DataFrame
-            df = pd.DataFrame(test_cases)
-            
-            # Ensure all required columns exist
-            for col in self.required_columns:
-                if col not in df.columns:
-                    df[col] = ""
-            
-            # Reorder columns
-            df = df[self.required_columns]
-            
-            # Create workbook with formatting
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Test Cases"
-            
-            # Add headers
-            for col_num, column_title in enumerate(self.required_columns, 1):
-                cell = ws.cell(row=1, column=col_num)
-                cell.value = column_title
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
-            
-            # Add data rows
-            for row_num, test_case in enumerate(test_cases, 2):
-                for col_num, column in enumerate(self.required_columns, 1):
-                    cell = ws.cell(row=row_num, column=col_num)
-                    value = test_case.get(column, "")
-                    
-                    # Handle multi-line content (Steps field)
-                    if column == "Steps" and "\\n" in str(value):
-                        value = value.replace("\\n", "\n")
-                        cell.alignment = Alignment(wrap_text=True, vertical="top")
-                    
-                    cell.value = value
-                    
-                    # Apply conditional formatting based on Priority
-                    if column == "Priority":
-                        if value == "High":
-                            cell.fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                        elif value == "Medium":
-                            cell.fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
-                        elif value == "Low":
-                            cell.fill = PatternFill(start_color="E6F3E6", end_color="E6F3E6", fill_type="solid")
-                    
-                    # Add borders to all cells
-                    cell.border = Border(
-                        left=Side(style='thin'),
-                        right=Side(style='thin'),
-                        top=Side(style='thin'),
-                        bottom=Side(style='thin')
-                    )
-            
-            # Auto-adjust column widths
-            self._adjust_column_widths(ws)
-            
-            # Add summary sheet
-            self._add_summary_sheet(wb, test_cases)
-            
-            # Save workbook
-            wb.save(output_path)
+            if engine == "xlsxwriter":
+                self._write_excel_xlsxwriter(test_cases, output_path)
+            elif engine == "openpyxl":
+                self._write_excel_openpyxl(test_cases, output_path)
+            else:
+                raise ValueError(f"Unknown Excel engine: {engine}")
             
             logger.info(f"Excel file exported successfully: {output_path}")
             return output_path
@@ -107,26 +124,116 @@ class TestCaseExporter:
             logger.error(f"Error exporting to Excel: {str(e)}")
             raise
     
-    def export_to_csv(self, test_cases: List[Dict[str, Any]], output_path: str) -> str:
-        """Export test cases to CSV format"""
+    def _write_excel_openpyxl(self, test_cases: List[Dict[str, Any]], output_path: str):
+        """Write the workbook with openpyxl"""
+        # Write-only workbook: rows are streamed to the file instead of kept as a cell grid
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Test Cases")
+        
+        self._add_named_styles(wb)
+        
+        # Column widths have to be set before the first row is written
+        self._adjust_column_widths(ws)
+        
+        # Add headers
+        header = []
+        for column_title in self.required_columns:
+            cell = WriteOnlyCell(ws, value=column_title)
+            cell.style = HEADER_STYLE
+            header.append(cell)
+        ws.append(header)
+        
+        # Add data rows (every cell is bordered)
+        for test_case in test_cases:
+            row = []
+            for column in self.required_columns:
+                value = test_case.get(column, "")
+                style = CELL_STYLE
+                
+                # Handle multi-line content (Steps field)
+                if column == "Steps" and "\\n" in str(value):
+                    value = value.replace("\\n", "\n")
+                    style = STEPS_STYLE
+                
+                cell = WriteOnlyCell(ws, value=value)
+                cell.style = style
+                row.append(cell)
+            ws.append(row)
+        
+        # Apply conditional formatting based on Priority
+        if test_cases:
+            priority_range = self._priority_range(len(test_cases))
+            for priority, fill in PRIORITY_FILLS.items():
+                ws.conditional_formatting.add(
+                    priority_range, CellIsRule(operator="equal", formula=[f'"{priority}"'], fill=fill)
+                )
+        
+        # Add summary sheet
+        self._add_summary_sheet(wb, test_cases)
+        
+        # Save workbook
+        wb.save(output_path)
+    
+    def _write_excel_xlsxwriter(self, test_cases: List[Dict[str, Any]], output_path: str):
+        """Write the workbook with xlsxwriter, streaming each row to disk as it is written"""
+        if xlsxwriter is None:
+            raise ImportError("xlsxwriter is not installed; use engine='openpyxl'")
+        
+        # strings_to_urls off: cells stay plain text, as with openpyxl
+        wb = xlsxwriter.Workbook(output_path, {"constant_memory": True, "strings_to_urls": False})
         try:
-            # Create DataFrame
-            df = pd.DataFrame(test_cases)
-            
-            # Ensure all required columns exist
-            for col in self.required_columns:
-                if col not in df.columns:
-                    df[col] = ""
+            header_format = wb.add_format(XLSXWRITER_HEADER_FORMAT)
+            cell_format = wb.add_format(XLSXWRITER_CELL_FORMAT)
+            steps_format = wb.add_format(XLSXWRITER_STEPS_FORMAT)
             
-            # Reorder columns
-            df = df[self.required_columns]
+            ws = wb.add_worksheet("Test Cases")
+            for column, width in COLUMN_WIDTHS.items():
+                ws.set_column(f"{column}:{column}", width)
             
-            # Clean multi-line content for CSV
-            for column in df.columns:
-                df[column] = df[column].astype(str).str.replace('\\n', ' | ')
+            ws.write_row(0, 0, self.required_columns, header_format)
             
-            # Export to CSV
-            df.to_csv(output_path, index=False, encoding='utf-8')
+            for row_num, test_case in enumerate(test_cases, 1):
+                for col_num, column in enumerate(self.required_columns):
+                    value = test_case.get(column, "")
+                    cell_fmt = cell_format
+                    if column == "Steps" and "\\n" in str(value):
+                        value = value.replace("\\n", "\n")
+                        cell_fmt = steps_format
+                    ws.write(row_num, col_num, value, cell_fmt)
+            
+            if test_cases:
+                priority_range = self._priority_range(len(test_cases))
+                for priority, color in XLSXWRITER_PRIORITY_COLORS.items():
+                    ws.conditional_format(priority_range, {
+                        "type": "cell", "criteria": "==", "value": f'"{priority}"',
+                        "format": wb.add_format({"bg_color": color})
+                    })
+            
+            summary_ws = wb.add_worksheet("Summary")
+            for column, width in SUMMARY_COLUMN_WIDTHS.items():
+                summary_ws.set_column(f"{column}:{column}", width)
+            heading_format = wb.add_format(XLSXWRITER_SUMMARY_HEADING_FORMAT)
+            for row_num, (label, value) in enumerate(self._summary_rows(test_cases)):
+                summary_ws.write(row_num, 0, label, heading_format if self._is_summary_heading(label) else None)
+                summary_ws.write(row_num, 1, value)
+        finally:
+            wb.close()
+    
+    def export_to_csv(self, test_cases: List[Dict[str, Any]], output_path: str) -> str:
+        """Export test cases to CSV format"""
+        try:
+            columns = self.required_columns
+            
+            # Stream rows straight from the dicts; os.linesep matches what DataFrame.to_csv wrote
+            with open(output_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f, lineterminator=os.linesep)
+                writer.writerow(columns)
+                # Missing and None fields are empty; multi-line content is flattened for CSV
+                writer.writerows(
+                    ["" if value is None else str(value).replace('\\n', ' | ')
+                     for value in map(case.get, columns)]
+                    for case in test_cases
+                )
             
             logger.info(f"CSV file exported successfully: {output_path}")
             return output_path
@@ -139,16 +246,16 @@ class TestCaseExporter:
         """Export test cases to JSON format"""
         try:
             # Ensure all test cases have required fields
-            cleaned_test_cases = []
-            for case in test_cases:
-                cleaned_case = {}
-                for field in self.required_columns:
-                    cleaned_case[field] = case.get(field, "")
-                cleaned_test_cases.append(cleaned_case)
+            columns = self.required_columns
+            cleaned_test_cases = [{field: case.get(field, "") for field in columns} for case in test_cases]
             
             # Export to JSON
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(cleaned_test_cases, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(cleaned_test_cases, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(cleaned_test_cases, f, indent=2, ensure_ascii=False)
             
             logger.info(f"JSON file exported successfully: {output_path}")
             return output_path
@@ -157,46 +264,74 @@ class TestCaseExporter:
             logger.error(f"Error exporting to JSON: {str(e)}")
             raise
     
+    def export_to_zstd_json(self, test_cases: List[Dict[str, Any]], output_path: str) -> str:
+        """Export test cases as zstd-compressed JSON (.json.zst), read back by load_zstd_json"""
+        if zstandard is None:
+            raise ImportError("zstandard is required for .json.zst export")
+        
+        try:
+            columns = self.required_columns
+            cleaned_test_cases = [{field: case.get(field, "") for field in columns} for case in test_cases]
+            
+            # Compact JSON: the cache is for reloading, not for reading
+            if orjson is not None:
+                data = orjson.dumps(cleaned_test_cases)
+            else:
+                data = json.dumps(cleaned_test_cases, ensure_ascii=False).encode('utf-8')
+            
+            with open(output_path, 'wb') as f:
+                f.write(zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1).compress(data))
+            
+            logger.info(f"Compressed JSON file exported successfully: {output_path}")
+            return output_path
+            
+        except Exception as e:
+            logger.error(f"Error exporting to compressed JSON: {str(e)}")
+            raise
+    
+    def load_zstd_json(self, input_path: str) -> List[Dict[str, Any]]:
+        """Test cases from a file written by export_to_zstd_json"""
+        if zstandard is None:
+            raise ImportError("zstandard is required to read .json.zst files")
+        
+        with open(input_path, 'rb') as f:
+            data = zstandard.ZstdDecompressor().decompress(f.read())
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+    
+    def _add_named_styles(self, workbook):
+        """Register the export's cell formats on a new workbook"""
+        styles = [
+            NamedStyle(name=HEADER_STYLE, font=HEADER_FONT, fill=HEADER_FILL,
+                       alignment=HEADER_ALIGNMENT, border=THIN_BORDER),
+            NamedStyle(name=CELL_STYLE, font=DEFAULT_FONT, border=THIN_BORDER),
+            NamedStyle(name=STEPS_STYLE, font=DEFAULT_FONT, alignment=WRAP_ALIGNMENT, border=THIN_BORDER),
+            NamedStyle(name=SUMMARY_HEADING_STYLE, font=SUMMARY_HEADING_FONT)
+        ]
+        for style in styles:
+            workbook.add_named_style(style)
+    
+    def _priority_range(self, num_cases: int) -> str:
+        """A1 range of the Priority column's data cells, e.g. J2:J101"""
+        column = get_column_letter(self.required_columns.index("Priority") + 1)
+        return f"{column}2:{column}{num_cases + 1}"
+    
     def _adjust_column_widths(self, worksheet):
         """Auto-adjust column widths based on content"""
-        column_widths = {
-            'A': 15,  # User Story ID
-            'B': 20,  # Acceptance Criteria ID
-            'C': 25,  # Scenario
-            'D': 15,  # Test Case ID
-            'E': 40,  # Test Case Description
-            'F': 30,  # Precondition
-            'G': 50,  # Steps
-            'H': 40,  # Expected Result
-            'I': 18,  # Part of Regression
-            'J': 12   # Priority
-        }
-        
-        for column, width in column_widths.items():
+        for column, width in COLUMN_WIDTHS.items():
             worksheet.column_dimensions[column].width = width
     
-    def _add_summary_sheet(self, workbook, test_cases: List[Dict[str, Any]]):
-        """Add a summary sheet with statistics"""
-        summary_ws = workbook.create_sheet("Summary")
-        
+    def _is_summary_heading(self, label: Any) -> bool:
+        """Whether a summary row label is a section heading"""
+        return "Distribution" in str(label) or "Summary Report" in str(label)
+    
+    def _summary_rows(self, test_cases: List[Dict[str, Any]]) -> List[List[Any]]:
+        """(label, value) rows of the summary sheet"""
         # Calculate statistics
         total_cases = len(test_cases)
-        priority_counts = {}
-        regression_counts = {}
-        user_story_counts = {}
-        
-        for case in test_cases:
-            # Priority distribution
-            priority = case.get("Priority", "Unknown")
-            priority_counts[priority] = priority_counts.get(priority, 0) + 1
-            
-            # Regression distribution
-            regression = case.get("Part of Regression", "Unknown")
-            regression_counts[regression] = regression_counts.get(regression, 0) + 1
-            
-            # User story distribution
-            user_story = case.get("User Story ID", "Unknown")
-            user_story_counts[user_story] = user_story_counts.get(user_story, 0) + 1
+        priority_counts = Counter(case.get("Priority", "Unknown") for case in test_cases)
+        regression_counts = Counter(case.get("Part of Regression", "Unknown") for case in test_cases)
+        # Stories keep first-seen order, as listed on the sheet
+        user_story_counts = Counter(case.get("User Story ID", "Unknown") for case in test_cases)
         
         # Add summary data
         summary_data = [
@@ -220,18 +355,25 @@ class TestCaseExporter:
         for story_id, count in user_story_counts.items():
             summary_data.append([story_id, count])
         
+        return summary_data
+    
+    def _add_summary_sheet(self, workbook, test_cases: List[Dict[str, Any]]):
+        """Add a summary sheet with statistics"""
+        summary_ws = workbook.create_sheet("Summary")
+        
+        # Adjust column widths (before any rows, as required by write-only sheets)
+        for column, width in SUMMARY_COLUMN_WIDTHS.items():
+            summary_ws.column_dimensions[column].width = width
+        
         # Write summary data to sheet
-        for row_num, (label, value) in enumerate(summary_data, 1):
-            summary_ws.cell(row=row_num, column=1, value=label)
-            summary_ws.cell(row=row_num, column=2, value=value)
-            
+        for label, value in self._summary_rows(test_cases):
             # Format headers
-            if "Distribution" in str(label) or "Summary Report" in str(label):
-                summary_ws.cell(row=row_num, column=1).font = Font(bold=True, size=12)
-        
-        # Adjust column widths
-        summary_ws.column_dimensions['A'].width = 25
-        summary_ws.column_dimensions['B'].width = 15
+            if self._is_summary_heading(label):
+                label_cell = WriteOnlyCell(summary_ws, value=label)
+                label_cell.style = SUMMARY_HEADING_STYLE
+                summary_ws.append([label_cell, value])
+            else:
+                summary_ws.append([label, value])
     
     def export_all_formats(self, test_cases: List[Dict[str, Any]], base_filename: str) -> Dict[str, str]:
         """Export test cases to all supported formats"""
@@ -252,6 +394,11 @@ class TestCaseExporter:
             json_path = base_path.with_suffix('.json')
             results['json'] = self.export_to_json(test_cases, str(json_path))
             
+            # Compressed JSON cache, when zstandard is installed
+            if zstandard is not None:
+                zst_path = base_path.with_suffix('.json.zst')
+                results['json_zst'] = self.export_to_zstd_json(test_cases, str(zst_path))
+            
             logger.info(f"All formats exported successfully to {base_path.parent}")
             return results
             
@@ -1,30 +1,65 @@
 # src/ui/streamlit_app.py
 import streamlit as st
 import os
+import io
 import json
+import hashlib
+import shutil
 import tempfile
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pandas as pd
-from typing import List, Dict, Any
+from typing import Iterator, List, Dict, Any
 import logging
 from dotenv import load_dotenv
+import httpx
+from openai import OpenAI
+from openpyxl.styles import Font, PatternFill
+
+try:
+    import xlsxwriter  # optional, streams the Excel download row by row (falls back to openpyxl)
+except ImportError:
+    xlsxwriter = None
+
+try:
+    import orjson  # optional, much faster JSON download (same output as json.dumps)
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # optional, HTTP/2 for the chat client's connection (falls back to HTTP/1.1)
+except ImportError:
+    h2 = None
 
 # Load environment variables
 load_dotenv()
 
 # Import our custom modules
 import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _src_dir not in sys.path:
+    sys.path.append(_src_dir)
 
 from processors.document_processor import DocumentProcessor
 from ai_engine.test_generator import TestCaseGenerator
+from ai_engine.response_cache import ResponseCache
 from exporters.excel_exporter import TestCaseExporter
+from config.runtime_state import is_pacs008_enabled
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows of the test case table sent to the browser per page
+TEST_CASES_PAGE_SIZE = 50
+# Chat answers are sampled (temperature 0.7), so a cached one is reused for an hour at most
+CHAT_CACHE_TTL_SECONDS = 60 * 60
+# Extracted uploads kept for reuse: enough for a few re-runs of recent batches, bounded because
+# each entry can hold the full text of a 50 MB document
+DOCUMENT_CACHE_MAX_ENTRIES = 32
+DOCUMENT_CACHE_TTL_SECONDS = 60 * 60
+
 # Page configuration
 st.set_page_config(
     page_title="ITASSIST - Test Case Generator",
@@ -33,6 +68,32 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource
+def get_doc_processor() -> DocumentProcessor:
+    """One DocumentProcessor per server process, shared by reruns and sessions"""
+    return DocumentProcessor()
+
+@st.cache_resource
+def get_exporter() -> TestCaseExporter:
+    """One TestCaseExporter per server process, shared by reruns and sessions"""
+    return TestCaseExporter()
+
+@st.cache_resource
+def get_document_cache() -> ResponseCache:
+    """Extracted content of uploads by content hash, in memory only (uploads stay off disk);
+    the least recently used entries are evicted beyond DOCUMENT_CACHE_MAX_ENTRIES"""
+    return ResponseCache(None, max_entries=DOCUMENT_CACHE_MAX_ENTRIES, ttl=DOCUMENT_CACHE_TTL_SECONDS)
+
+@st.cache_resource
+def get_openai_client(api_key: str):
+    """OpenAI client per API key, so chat turns reuse its keep-alive connections"""
+    http_client = httpx.Client(
+        http2=h2 is not None,
+        limits=httpx.Limits(max_keepalive_connections=10),
+        timeout=httpx.Timeout(600.0, connect=5.0)  # same as the OpenAI client default
+    )
+    return OpenAI(api_key=api_key, http_client=http_client)
+
 def main():
     """Main Streamlit application"""
     
@@ -72,6 +133,10 @@ def main():
             ["Excel", "CSV", "JSON"],
             default=["Excel"]
         )
+        
+        # Feature status detected by main.py at startup
+        if is_pacs008_enabled():
+            st.caption("🏦 PACS.008 Smart Mode: ENABLED")
     
     # Initialize session state
     if 'generated_test_cases' not in st.session_state:
@@ -170,37 +235,55 @@ def process_files(uploaded_files, api_key: str, custom_instructions: str,
     """Process uploaded files and generate test cases"""
     
     # Initialize processors
-    doc_processor = DocumentProcessor()
+    doc_processor = get_doc_processor()
     test_generator = TestCaseGenerator(api_key)
     
     progress_bar = st.progress(0)
     status_text = st.empty()
     
     try:
-        all_content = []
-        total_files = len(uploaded_files)
-        
-        # Process each file
-        for i, uploaded_file in enumerate(uploaded_files):
-            status_text.text(f"Processing {uploaded_file.name}...")
-            progress_bar.progress((i + 1) / (total_files + 2))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Uploads are already in memory and are processed from their bytes; ZIP members
+            # are streamed to disk so large archives never sit in memory whole
+            status_text.text("Preparing uploaded files...")
+            files = []
+            for uploaded_file in uploaded_files:
+                # Handle ZIP files
+                if uploaded_file.name.endswith('.zip'):
+                    files.extend(extract_zip_file(uploaded_file, doc_processor, temp_dir))
+                else:
+                    files.append((uploaded_file.name, uploaded_file.getvalue()))
             
-            # Handle ZIP files
-            if uploaded_file.name.endswith('.zip'):
-                extracted_content = process_zip_file(uploaded_file, doc_processor)
-                all_content.extend(extracted_content)
-            else:
-                # Save uploaded file temporarily
-                with tempfile.NamedTemporaryFile(delete=False, suffix=Path(uploaded_file.name).suffix) as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
-                    tmp_file_path = tmp_file.name
-                
-                # Process the file
-                result = doc_processor.process_file(tmp_file_path)
-                all_content.append(result)
-                
-                # Clean up temporary file
-                os.unlink(tmp_file_path)
+            # Uploads seen before (same bytes and type) reuse their extracted content
+            doc_cache = get_document_cache()
+            keys = [None] * len(files)
+            upload_indexes = [i for i, item in enumerate(files) if not isinstance(item, str)]
+            fingerprints = fingerprint_uploads([files[i][1] for i in upload_indexes])
+            for i, fingerprint in zip(upload_indexes, fingerprints):
+                keys[i] = ResponseCache.make_key("document", fingerprint, Path(files[i][0]).suffix.lower())
+            
+            all_content = []
+            for i, key in enumerate(keys):
+                cached = doc_cache.get(key) if key is not None else None
+                if cached is not None:
+                    cached['file_name'] = files[i][0]
+                all_content.append(cached)
+            pending = [i for i, content in enumerate(all_content) if content is None]
+            
+            # Process the rest in parallel, advancing the progress bar as results come in
+            status_text.text(f"Processing {len(pending)} documents...")
+            
+            def show_progress(done: int, total: int):
+                progress_bar.progress(done / (total + 2))
+            
+            results = doc_processor.process_files([files[i] for i in pending],
+                                                  max_workers=get_document_workers(),
+                                                  progress_callback=show_progress)
+            for i, result in zip(pending, results):
+                all_content[i] = result
+                # Failures are not cached, so a retry processes the file again
+                if keys[i] is not None and not result.get('error'):
+                    doc_cache.put(keys[i], result)
         
         # Combine all extracted content
         status_text.text("Combining extracted content...")
@@ -217,7 +300,12 @@ def process_files(uploaded_files, api_key: str, custom_instructions: str,
         status_text.text("Generating test cases with AI...")
         progress_bar.progress(0.95)
         
-        test_cases = test_generator.generate_test_cases(combined_content, generation_instructions)
+        def show_generation_progress(done: int, total: int):
+            status_text.text(f"Generating test cases with AI... ({done}/{total} stories)")
+            progress_bar.progress(0.95 + 0.05 * done / total)
+        
+        test_cases = test_generator.generate_test_cases(combined_content, generation_instructions,
+                                                        progress_callback=show_generation_progress)
         
         if test_cases:
             st.session_state.generated_test_cases = test_cases
@@ -239,25 +327,61 @@ def process_files(uploaded_files, api_key: str, custom_instructions: str,
     except Exception as e:
         st.error(f"Error during processing: {str(e)}")
         logger.error(f"Processing error: {str(e)}")
+    finally:
+        # Each run has its own generator; release its connection pool and event loop
+        try:
+            test_generator.close()
+        except Exception as e:
+            logger.warning(f"Could not close test generator: {str(e)}")
 
-def process_zip_file(zip_file, doc_processor: DocumentProcessor) -> List[Dict]:
-    """Process files within a ZIP archive"""
-    extracted_content = []
-    
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Extract ZIP file
-        with zipfile.ZipFile(zip_file, 'r') as zip_ref:
-            zip_ref.extractall(temp_dir)
-        
-        # Process each extracted file
-        for root, dirs, files in os.walk(temp_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                if Path(file_path).suffix.lower() in doc_processor.supported_formats:
-                    result = doc_processor.process_file(file_path)
-                    extracted_content.append(result)
-    
-    return extracted_content
+def get_document_workers() -> int:
+    """Worker processes for document processing: DOC_WORKERS, or one less than the CPU count"""
+    workers = os.getenv("DOC_WORKERS")
+    if workers:
+        try:
+            return max(1, int(workers))
+        except ValueError:
+            logger.warning(f"Ignoring invalid DOC_WORKERS value: {workers}")
+    return max(1, (os.cpu_count() or 2) - 1)
+
+def fingerprint_upload(data: bytes) -> str:
+    """Content hash of an upload, for the document cache key"""
+    # SHA-256 rather than BLAKE2b: with SHA-NI it hashes large inputs ~3x faster
+    return hashlib.sha256(data).hexdigest()
+
+def fingerprint_uploads(contents: List[bytes]) -> List[str]:
+    """fingerprint_upload() of each upload; hashlib releases the GIL on large inputs, so they
+    are hashed on parallel threads"""
+    if len(contents) < 2:
+        return [fingerprint_upload(data) for data in contents]
+    with ThreadPoolExecutor(max_workers=min(len(contents), os.cpu_count() or 1)) as executor:
+        return list(executor.map(fingerprint_upload, contents))
+
+def extract_zip_file(zip_file, doc_processor: DocumentProcessor, temp_dir: str) -> List[str]:
+    """Write the supported files of a ZIP archive under temp_dir and return their paths"""
+    extract_dir = tempfile.mkdtemp(dir=temp_dir)
+    file_paths = []
+    
+    with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+        # Stream members one at a time instead of extractall: unsupported members are never
+        # written, and memory stays bounded by the copy buffer, not the member size
+        for index, info in enumerate(zip_ref.infolist()):
+            if info.is_dir():
+                continue
+            file_name = Path(info.filename).name
+            if Path(file_name).suffix.lower() not in doc_processor.supported_formats:
+                continue
+            
+            # One directory per member keeps the original file name (shown in the combined
+            # content) without collisions, and ignores any path components in the archive
+            member_dir = os.path.join(extract_dir, str(index))
+            os.mkdir(member_dir)
+            file_path = os.path.join(member_dir, file_name)
+            with zip_ref.open(info) as source, open(file_path, 'wb') as target:
+                shutil.copyfileobj(source, target, 1 << 20)
+            file_paths.append(file_path)
+    
+    return file_paths
 
 def combine_extracted_content(content_list: List[Dict]) -> str:
     """Combine content from multiple files"""
@@ -298,6 +422,19 @@ def build_generation_instructions(custom_instructions: str, num_test_cases: int,
     
     return ". ".join(instructions)
 
+def get_test_cases_frame(test_cases: List[Dict]) -> pd.DataFrame:
+    """DataFrame of the generated test cases, rebuilt only when the list is replaced"""
+    cached = st.session_state.get('test_cases_frame')
+    if cached is None or cached[0] is not test_cases:
+        df = pd.DataFrame(test_cases)
+        # Filter columns must exist even if the model omitted them
+        for col in ("Priority", "Part of Regression", "User Story ID"):
+            if col not in df.columns:
+                df[col] = None
+        cached = (test_cases, df)
+        st.session_state.test_cases_frame = cached
+    return cached[1]
+
 def display_test_cases_tab(export_formats: List[str]):
     """Display generated test cases"""
     
@@ -308,62 +445,64 @@ def display_test_cases_tab(export_formats: List[str]):
         return
     
     test_cases = st.session_state.generated_test_cases
+    all_df = get_test_cases_frame(test_cases)
+    story_ids = list(all_df["User Story ID"].fillna("").unique())
     
     # Display summary metrics
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         st.metric("Total Test Cases", len(test_cases))
     with col2:
-        high_priority = len([tc for tc in test_cases if tc.get("Priority") == "High"])
+        high_priority = int(all_df["Priority"].eq("High").sum())
         st.metric("High Priority", high_priority)
     with col3:
-        regression_tests = len([tc for tc in test_cases if tc.get("Part of Regression") == "Yes"])
+        regression_tests = int(all_df["Part of Regression"].eq("Yes").sum())
         st.metric("Regression Tests", regression_tests)
     with col4:
-        unique_stories = len(set(tc.get("User Story ID", "") for tc in test_cases))
-        st.metric("User Stories", unique_stories)
+        st.metric("User Stories", len(story_ids))
     
-    # Filter options
+    # Filter options. Inside a form the selections apply together on submit, so adjusting
+    # several filters costs one rerun; until then the widgets return the last applied values.
     with st.expander("🔍 Filter Test Cases"):
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            priority_filter = st.multiselect(
-                "Priority", 
-                ["High", "Medium", "Low"],
-                default=["High", "Medium", "Low"]
-            )
-        
-        with col2:
-            regression_filter = st.multiselect(
-                "Regression", 
-                ["Yes", "No"],
-                default=["Yes", "No"]
-            )
-        
-        with col3:
-            story_ids = list(set(tc.get("User Story ID", "") for tc in test_cases))
-            story_filter = st.multiselect(
-                "User Story ID",
-                story_ids,
-                default=story_ids
-            )
+        with st.form("filter_form"):
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                priority_filter = st.multiselect(
+                    "Priority", 
+                    ["High", "Medium", "Low"],
+                    default=["High", "Medium", "Low"]
+                )
+            
+            with col2:
+                regression_filter = st.multiselect(
+                    "Regression", 
+                    ["Yes", "No"],
+                    default=["Yes", "No"]
+                )
+            
+            with col3:
+                story_filter = st.multiselect(
+                    "User Story ID",
+                    story_ids,
+                    default=story_ids
+                )
+            
+            st.form_submit_button("Apply Filters")
     
-    # Apply filters
-    filtered_test_cases = [
-        tc for tc in test_cases
-        if (tc.get("Priority") in priority_filter and
-            tc.get("Part of Regression") in regression_filter and
-            tc.get("User Story ID") in story_filter)
-    ]
+    # Apply filters as one boolean mask over the cached frame
+    mask = (
+        all_df["Priority"].isin(priority_filter) &
+        all_df["Part of Regression"].isin(regression_filter) &
+        all_df["User Story ID"].isin(story_filter)
+    ).to_numpy()
+    df = all_df[mask]
+    filtered_test_cases = [test_cases[i] for i in mask.nonzero()[0]]
     
     # Display test cases table
     if filtered_test_cases:
         st.subheader(f"Test Cases ({len(filtered_test_cases)} of {len(test_cases)})")
         
-        # Convert to DataFrame for display
-        df = pd.DataFrame(filtered_test_cases)
-        
         # Configure column display
         column_config = {
             "Steps": st.column_config.TextColumn(width="large"),
@@ -371,8 +510,17 @@ def display_test_cases_tab(export_formats: List[str]):
             "Expected Result": st.column_config.TextColumn(width="medium"),
         }
         
+        # Only the current page is serialised to the browser; the exports still cover every row.
+        # The widget resets to page 1 whenever the page count changes with the filters.
+        num_pages = (len(df) + TEST_CASES_PAGE_SIZE - 1) // TEST_CASES_PAGE_SIZE
+        page = 1
+        if num_pages > 1:
+            page = int(st.number_input(f"Page (of {num_pages})", min_value=1, max_value=num_pages,
+                                       value=1, step=1))
+        start = (page - 1) * TEST_CASES_PAGE_SIZE
+        
         st.dataframe(
-            df,
+            df.iloc[start:start + TEST_CASES_PAGE_SIZE],
             use_container_width=True,
             column_config=column_config,
             hide_index=True
@@ -383,91 +531,110 @@ def display_test_cases_tab(export_formats: List[str]):
         
         col1, col2, col3 = st.columns(3)
         
-        exporter = TestCaseExporter()
+        filter_key = (tuple(priority_filter), tuple(regression_filter), tuple(story_filter))
+        payloads = get_export_payloads(test_cases, filter_key, df, filtered_test_cases, export_formats)
         
         if "Excel" in export_formats:
             with col1:
-                if st.button("📊 Download Excel", type="primary"):
-                    try:
-                        # Create Excel in memory instead of temp file
-                        import io
-                        from openpyxl import Workbook
-                        
-                        # Use our exporter but modify to work with BytesIO
-                        exporter = TestCaseExporter()
-                        
-                        # Create DataFrame
-                        df = pd.DataFrame(filtered_test_cases)
-                        
-                        # Ensure all required columns exist
-                        for col in exporter.required_columns:
-                            if col not in df.columns:
-                                df[col] = ""
-                        
-                        # Reorder columns
-                        df = df[exporter.required_columns]
-                        
-                        # Create Excel file in memory
-                        output = io.BytesIO()
-                        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                            df.to_excel(writer, sheet_name='Test Cases', index=False)
-                            
-                            # Get workbook and worksheet for formatting
-                            workbook = writer.book
-                            worksheet = writer.sheets['Test Cases']
-                            
-                            # Apply basic formatting
-                            from openpyxl.styles import Font, PatternFill
-                            
-                            # Header formatting
-                            for cell in worksheet[1]:
-                                cell.font = Font(bold=True, color="FFFFFF")
-                                cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                        
-                        output.seek(0)
-                        
-                        st.download_button(
-                            label="📊 Download Excel File",
-                            data=output.getvalue(),
-                            file_name=f"test_cases_{len(filtered_test_cases)}.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                        )
-                        
-                    except Exception as e:
-                        st.error(f"Export error: {str(e)}")
-                        logger.error(f"Excel export error: {str(e)}")
+                if "xlsx" in payloads:
+                    st.download_button(
+                        label="📊 Download Excel",
+                        data=payloads["xlsx"],
+                        file_name=f"test_cases_{len(filtered_test_cases)}.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        type="primary"
+                    )
         
         if "CSV" in export_formats:
             with col2:
-                if st.button("📄 Download CSV"):
-                    try:
-                        csv_data = pd.DataFrame(filtered_test_cases).to_csv(index=False)
-                        st.download_button(
-                            label="📄 Download CSV File",
-                            data=csv_data,
-                            file_name=f"test_cases_{len(filtered_test_cases)}.csv",
-                            mime="text/csv"
-                        )
-                    except Exception as e:
-                        st.error(f"Export error: {str(e)}")
+                if "csv" in payloads:
+                    st.download_button(
+                        label="📄 Download CSV",
+                        data=payloads["csv"],
+                        file_name=f"test_cases_{len(filtered_test_cases)}.csv",
+                        mime="text/csv"
+                    )
         
         if "JSON" in export_formats:
             with col3:
-                if st.button("🔧 Download JSON"):
-                    try:
-                        json_data = json.dumps(filtered_test_cases, indent=2, ensure_ascii=False)
-                        st.download_button(
-                            label="🔧 Download JSON File",
-                            data=json_data,
-                            file_name=f"test_cases_{len(filtered_test_cases)}.json",
-                            mime="application/json"
-                        )
-                    except Exception as e:
-                        st.error(f"Export error: {str(e)}")
+                if "json" in payloads:
+                    st.download_button(
+                        label="🔧 Download JSON",
+                        data=payloads["json"],
+                        file_name=f"test_cases_{len(filtered_test_cases)}.json",
+                        mime="application/json"
+                    )
     
     else:
         st.warning("No test cases match the selected filters.")
 
+def get_export_payloads(test_cases: List[Dict], filter_key: tuple, df: pd.DataFrame,
+                        filtered_test_cases: List[Dict], export_formats: List[str]) -> Dict[str, bytes]:
+    """Export bytes for the current filter, rebuilt only when the cases, filters or formats change"""
+    key = (filter_key, tuple(export_formats))
+    cached = st.session_state.get('export_payloads')
+    if cached is not None and cached[0] is test_cases and cached[1] == key:
+        return cached[2]
+    
+    payloads = {}
+    if "Excel" in export_formats:
+        try:
+            payloads["xlsx"] = build_excel_bytes(df, get_exporter().required_columns)
+        except Exception as e:
+            st.error(f"Export error: {str(e)}")
+            logger.error(f"Excel export error: {str(e)}")
+    if "CSV" in export_formats:
+        try:
+            payloads["csv"] = df.to_csv(index=False).encode("utf-8")
+        except Exception as e:
+            st.error(f"Export error: {str(e)}")
+    if "JSON" in export_formats:
+        try:
+            if orjson is not None:
+                payloads["json"] = orjson.dumps(filtered_test_cases, option=orjson.OPT_INDENT_2)
+            else:
+                payloads["json"] = json.dumps(filtered_test_cases, indent=2, ensure_ascii=False).encode("utf-8")
+        except Exception as e:
+            st.error(f"Export error: {str(e)}")
+    
+    # A failed format is retried on the next rerun instead of being cached as missing
+    if len(payloads) == len([f for f in ("Excel", "CSV", "JSON") if f in export_formats]):
+        st.session_state.export_payloads = (test_cases, key, payloads)
+    return payloads
+
+def build_excel_bytes(df: pd.DataFrame, required_columns: List[str]) -> bytes:
+    """Write the test cases to an in-memory workbook with a styled header row"""
+    # Ensure all required columns exist, in export order
+    export_df = df.reindex(columns=required_columns, fill_value="")
+    
+    output = io.BytesIO()
+    if xlsxwriter is not None:
+        # constant_memory flushes each row once written, so rows must go out in order;
+        # pandas' to_excel writes column by column and would drop cells in this mode
+        workbook = xlsxwriter.Workbook(output, {"constant_memory": True, "strings_to_urls": False})
+        try:
+            worksheet = workbook.add_worksheet("Test Cases")
+            header_format = workbook.add_format({"bold": True, "font_color": "#FFFFFF", "bg_color": "#366092"})
+            worksheet.write_row(0, 0, required_columns, header_format)
+            # Missing values become blank cells, as with to_excel
+            values = export_df.astype(object).where(export_df.notna(), None)
+            for row_num, row in enumerate(values.itertuples(index=False, name=None), 1):
+                worksheet.write_row(row_num, 0, row)
+        finally:
+            workbook.close()
+        return output.getvalue()
+    
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        export_df.to_excel(writer, sheet_name='Test Cases', index=False)
+        worksheet = writer.sheets['Test Cases']
+        
+        # Header formatting
+        for cell in worksheet[1]:
+            cell.font = Font(bold=True, color="FFFFFF")
+            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    
+    return output.getvalue()
+
 def chat_assistant_tab(api_key: str):
     """Chat assistant for test case customization"""
     
@@ -498,21 +665,24 @@ def chat_assistant_tab(api_key: str):
         with st.chat_message("user"):
             st.markdown(prompt)
         
-        # Generate response
+        # Stream the response as it is generated
         with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                response = generate_chat_response(prompt, st.session_state.generated_test_cases, api_key)
-                st.markdown(response)
+            response = st.write_stream(
+                generate_chat_response(prompt, st.session_state.generated_test_cases, api_key)
+            )
         
         # Add assistant message
         st.session_state.chat_messages.append({"role": "assistant", "content": response})
 
-def generate_chat_response(prompt: str, test_cases: List[Dict], api_key: str) -> str:
-    """Generate chat response about test cases"""
+@st.cache_resource
+def get_chat_cache() -> ResponseCache:
+    """Cache of chat answers, shared by reruns and sessions; in memory only, since entries hold
+    the user's questions and test case text, which must not outlive the server"""
+    return ResponseCache(None, ttl=CHAT_CACHE_TTL_SECONDS)
+
+def generate_chat_response(prompt: str, test_cases: List[Dict], api_key: str) -> Iterator[str]:
+    """Generate chat response about test cases, yielding it chunk by chunk as the model streams it"""
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
-        
         # Prepare context
         test_cases_summary = f"Total test cases: {len(test_cases)}\n"
         test_cases_summary += "Sample test cases:\n"
@@ -531,20 +701,44 @@ def generate_chat_response(prompt: str, test_cases: List[Dict], api_key: str) ->
         provide specific suggestions or instructions.
         """
         
-        response = client.chat.completions.create(
-            model="gpt-4.1-mini-2025-04-14",
-            messages=[
-                {"role": "system", "content": "You are a helpful BFSI testing expert."},
-                {"role": "user", "content": chat_prompt}
-            ],
+        model = "gpt-4.1-mini-2025-04-14"
+        messages = [
+            {"role": "system", "content": "You are a helpful BFSI testing expert."},
+            {"role": "user", "content": chat_prompt}
+        ]
+        
+        # The messages hold everything the model sees, so identical ones get the same answer
+        chat_cache = get_chat_cache()
+        cache_key = ResponseCache.make_key(model, "chat", messages)
+        cached = chat_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        client = get_openai_client(api_key)
+        
+        stream = client.chat.completions.create(
+            model=model,
+            messages=messages,
             temperature=0.7,
-            max_tokens=500
+            max_tokens=500,
+            stream=True
         )
         
-        return response.choices[0].message.content
+        parts = []
+        for chunk in stream:
+            # Some chunks (e.g. a trailing usage chunk) carry no choices or no content
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+        
+        answer = "".join(parts)
+        if answer:
+            chat_cache.put(cache_key, answer)
         
     except Exception as e:
-        return f"Sorry, I encountered an error: {str(e)}"
+        yield f"Sorry, I encountered an error: {str(e)}"
 
 if __name__ == "__main__":
     main()
\ No newline at end of file